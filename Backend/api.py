@@ -1,11 +1,10 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, Dict
 from json_to_graph import load_graph
 import pathfinder
 import traffic_updater
-from simulator import run_simulation
 from multi_vehicle_simulator import MultiVehicleSimulator
 from vehicle import VehicleType, TrafficConfig
 import config
@@ -94,7 +93,8 @@ def get_path(start: str, goal: str, mode: str):
         start,
         goal,
         mode,
-        blocked_roads=set(simulator.blocked_roads.keys())
+        blocked_roads=set(simulator.blocked_roads.keys()),
+        landmarks=simulator.get_landmark_tables()
     )
 
     # Handle infinity cost (no path found)
@@ -264,6 +264,24 @@ def get_all_vehicles():
     }
 
 
+@app.get("/vehicles/snapshot")
+def get_vehicles_snapshot():
+    """Get all vehicles in column form (one array per field, same order in every array)"""
+    return simulator.get_vehicles_snapshot()
+
+
+@app.get("/vehicles/near")
+def get_vehicles_near(x: float, y: float, radius: float):
+    """Get vehicles on a road within a radius of a map point"""
+    if radius < 0:
+        raise HTTPException(status_code=400, detail="Radius must not be negative")
+    vehicles = simulator.get_vehicles_near(x, y, radius)
+    return {
+        "vehicles": [vehicle.to_dict() for vehicle in vehicles],
+        "count": len(vehicles)
+    }
+
+
 @app.get("/vehicle/{vehicle_id}")
 def get_vehicle(vehicle_id: str):
     """Get specific vehicle by ID"""
@@ -7,4 +7,9 @@ DEFAULT_TRAFFIC_MULTIPLIER = 1.0
 MIN_TRAFFIC_MULTIPLIER = 0.5
 MAX_TRAFFIC_MULTIPLIER = 3.0
 
-REROUTE_THRESHOLD = 0.2  # rerun A* if path cost increases by 20% or more
\ No newline at end of file
+REROUTE_THRESHOLD = 0.2  # rerun A* if path cost increases by 20% or more
+ROUTE_TABLE_SMOOTHING = 0.05  # weight of each tick's multipliers in the moving average the routing tables are built on
+ROUTE_TABLE_DRIFT_THRESHOLD = 0.3  # an edge has drifted once its smoothed multiplier moves 30% or more
+ROUTE_TABLE_DRIFT_SHARE = 0.1  # rebuild a mode's next-hop table once 10% of its edges have drifted
+ROUTE_TABLE_REBUILD_INTERVAL = 100  # min ticks between table rebuilds
+ALT_MIN_NODES = 5000  # use the landmark (ALT) heuristic for live A* only on graphs at least this large; euclidean is faster below
\ No newline at end of file
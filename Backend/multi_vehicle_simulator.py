@@ -4,15 +4,49 @@
 
 import random
 import time
-from datetime import datetime
+import heapq
 from typing import List, Dict, Tuple, Optional
-from collections import deque
+from collections.abc import Mapping
+import numpy as np
 import pathfinder
 from vehicle import Vehicle, VehicleType, VehicleStatus, VehicleManager, TrafficConfig
+from spatial_index import VehicleSpatialGrid, world_bounds
 from traffic_analyzer import TrafficAnalyzer
 import config
 
 
+# Traffic multiplier applied to a road by an accident of each severity
+_SEVERITY_MULT = {"minor": 2.0, "moderate": 4.0, "severe": 10.0}
+_SEVERITY_CHOICES = ("minor", "moderate", "severe")
+
+
+
+class EdgeMultiplierView(Mapping):
+    """
+    Dict-like view of the dense traffic multiplier array, keyed by (from_node, to_node).
+    Keeps dict-based callers (traffic analyzer, pathfinder) working on the array storage.
+    """
+    
+    def __init__(self, edge_id: Dict[Tuple[str, str], int], values: np.ndarray):
+        self._edge_id = edge_id
+        self._values = values
+        
+    def __getitem__(self, edge: Tuple[str, str]) -> float:
+        return float(self._values[self._edge_id[edge]])
+        
+    def __setitem__(self, edge: Tuple[str, str], multiplier: float):
+        self._values[self._edge_id[edge]] = multiplier
+        
+    def __contains__(self, edge) -> bool:
+        return edge in self._edge_id
+        
+    def __iter__(self):
+        return iter(self._edge_id)
+        
+    def __len__(self) -> int:
+        return len(self._edge_id)
+
+
 class MultiVehicleSimulator:
     """
     Main simulation engine for multi-vehicle traffic simulation.
@@ -34,7 +68,21 @@ class MultiVehicleSimulator:
         self.heuristic_coords = heuristic_coords
         self.vehicle_manager = VehicleManager()
         self.traffic_analyzer = TrafficAnalyzer(graph, self.vehicle_manager)
-        self.traffic_multipliers: Dict[Tuple[str, str], float] = {}
+        self.edge_id: Dict[Tuple[str, str], int] = {}  # Edge -> dense integer id for array storage
+        self.tm_arr: np.ndarray = np.empty(0)  # Traffic multipliers by edge id
+        self.traffic_multipliers: EdgeMultiplierView = EdgeMultiplierView(self.edge_id, self.tm_arr)
+        self._edge_str_keys: List[str] = []  # "from,to" JSON keys in edge id order
+        self.node_index: Dict[str, int] = {node: i for i, node in enumerate(graph)}  # Node ID -> integer index
+        self._node_xy = np.array(
+            [heuristic_coords[node] for node in graph], dtype=np.float64
+        ).reshape(-1, 2)  # Node coordinates by node index
+        min_x, min_y, max_x, max_y = world_bounds(heuristic_coords)
+        # Vehicle store slots by position, in a grid about 64 cells across the map.
+        # Built on demand by get_vehicles_near, at most once per tick
+        self._grid = VehicleSpatialGrid(max(max_x - min_x, max_y - min_y, 1e-6) / 64)
+        self._grid_stamp: Tuple[int, int] = (-1, -1)  # (step, manager version) the grid was built at
+        # Serialized vehicles, reused until the next tick or until vehicles are added/removed
+        self._vehicles_json_cache: Tuple[Tuple[int, int], List[dict]] = ((-1, -1), [])
         self.simulation_step = 0
         self.is_running = False
         self.total_spawned = 0
@@ -52,12 +100,54 @@ class MultiVehicleSimulator:
         self.blocked_roads: Dict[Tuple[str, str], dict] = {}  # Blocked roads with metadata
         self.accidents: Dict[str, dict] = {}  # Active accidents by ID
         self.accident_counter = 0
+        self._accident_expiry: List[Tuple[float, str]] = []  # Min-heap of (expiry time, accident ID)
         self.congestion_points: List[Tuple[str, str]] = []  # Natural congestion hotspots
+        self._hotspot_ids = np.empty(0, dtype=np.int64)  # Edge ids of the hotspots
+        
+        # Uniform draws for the per-tick accident/blockage rolls, refilled in batches
+        self._event_draws: List[Tuple[float, float]] = []
+        self._event_draw_pos = 0
+        
+        # Cached sampler for the last vehicle type distribution (see _sample_vehicle_types)
+        self._dist_key: Optional[tuple] = None
+        self._dist_types: List[VehicleType] = []
+        self._dist_cum: List[float] = []
+        
+        # Precomputed routing tables per travel mode: next_hop[mode][u][v] is the first
+        # node after u on the shortest u -> v route, route_dist[mode][u][v] its cost
+        self.next_hop: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.route_dist: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.dirty_modes: set = set()  # Modes whose tables are stale and due for a rebuild
+        self._route_snapshot: Dict[str, np.ndarray] = {}  # Smoothed multipliers each table was built on
+        self._mode_edges: Dict[str, np.ndarray] = {}  # Ids of the edges usable by each mode
+        self._routes_built_step = 0  # Tick at which routing tables were last rebuilt
+        
+        # Reroute results shared by vehicles with the same (node, goal, mode) within a
+        # 20-tick bucket; the traffic version is bumped whenever roads are blocked, unblocked,
+        # hit by an accident or the routing tables are rebuilt, so stale routes are never reused
+        self._path_cache: Dict[Tuple[str, str, str], Tuple[Optional[List[str]], float]] = {}
+        self._path_cache_epoch: Tuple[int, int] = (0, 0)  # (step bucket, traffic version)
+        self._traffic_version = 0
+        
+        # ALT landmarks for live A* searches: landmark_dist[node][i] is the lower-bound
+        # distance from landmark i to node, landmark_dist_to[node][i] from node to landmark i
+        self.landmarks: List[str] = []
+        self.landmark_dist: Dict[str, List[float]] = {}
+        self.landmark_dist_to: Dict[str, List[float]] = {}
         
         # Initialize traffic multipliers and calculate edge lengths
         self._initialize_traffic_multipliers()
+        self.vehicle_manager.set_edge_index(self.edge_id)
+        self._edge_nodes = np.array(
+            [(self.node_index[u], self.node_index[v]) for (u, v) in self.edge_id], dtype=np.int64
+        ).reshape(-1, 2)  # (from, to) node indices by edge id
+        self._node_list: List[str] = list(self.graph.keys())  # Cached node list for random picks
+        self._node_arr = np.array(self._node_list, dtype=object)  # Same nodes for batched sampling
+        self._build_routing_tables()
+        self._precompute_landmarks()
         self._calculate_edge_lengths()
         self._identify_congestion_hotspots()
+        self.edge_blocked = np.zeros(len(self.edge_id), dtype=np.bool_)  # Mirrors blocked_roads by edge id
     
     def get_simulation_time(self) -> dict:
         """
@@ -100,43 +190,200 @@ class MultiVehicleSimulator:
         return self.get_simulation_time()["hour"]
         
     def _calculate_edge_lengths(self):
-        """Calculate and cache edge lengths in pixels"""
-        for node in self.graph:
-            if node not in self.heuristic_coords:
-                continue
-            x1, y1 = self.heuristic_coords[node]
-            for edge in self.graph[node]:
-                to_node = edge["to"]
-                if to_node not in self.heuristic_coords:
-                    continue
-                x2, y2 = self.heuristic_coords[to_node]
-                # Calculate Euclidean distance (scaled to pixels)
-                distance = ((x2 - x1)**2 + (y2 - y1)**2) ** 0.5 * 110  # SCALE factor
-                self.edge_lengths[(node, to_node)] = max(distance, 50.0)  # Minimum 50 pixels
+        """Calculate and cache edge lengths in pixels (one vectorized pass over all edges)"""
+        edges = [
+            edge for edge in self.edge_id
+            if edge[0] in self.heuristic_coords and edge[1] in self.heuristic_coords
+        ]
+        from_xy = np.array([self.heuristic_coords[u] for u, _ in edges], dtype=np.float64).reshape(-1, 2)
+        to_xy = np.array([self.heuristic_coords[v] for _, v in edges], dtype=np.float64).reshape(-1, 2)
+        
+        # Euclidean distance scaled to pixels (SCALE factor 110), minimum 50 pixels
+        distances = np.maximum(
+            np.hypot(to_xy[:, 0] - from_xy[:, 0], to_xy[:, 1] - from_xy[:, 1]) * 110.0, 50.0
+        )
+        self.edge_lengths = dict(zip(edges, distances.tolist()))
+        
+        # Same lengths indexed by edge id for the physics kernels (100 pixels if coords are missing)
+        self.edge_length_arr = np.full(len(self.edge_id), 100.0, dtype=np.float64)
+        self.edge_length_arr[[self.edge_id[edge] for edge in edges]] = distances
     
     def _identify_congestion_hotspots(self):
         """Identify potential congestion hotspots based on network topology"""
         # Find nodes with high connectivity (intersections)
-        node_degrees = {}
-        for node in self.graph:
-            node_degrees[node] = len(self.graph[node])
+        node_degrees = np.fromiter(
+            (len(self.graph[node]) for node in self._node_list), dtype=np.int64, count=len(self._node_list)
+        )
         
-        # Select top 20% as potential hotspots
-        sorted_nodes = sorted(node_degrees.items(), key=lambda x: x[1], reverse=True)
-        hotspot_count = max(1, len(sorted_nodes) // 5)
+        # Select top 20% as potential hotspots (partial selection, no full sort)
+        if len(node_degrees):
+            hotspot_count = max(1, len(node_degrees) // 5)
+            top_nodes = np.argpartition(-node_degrees, hotspot_count - 1)[:hotspot_count]
+            
+            candidate_edges = [
+                (node, edge["to"])
+                for node in self._node_arr[top_nodes].tolist()
+                for edge in self.graph[node]
+            ]
+            # 30% chance each edge is a hotspot
+            is_hotspot = np.random.random(len(candidate_edges)) < 0.3
+            self.congestion_points.extend(
+                edge for edge, hot in zip(candidate_edges, is_hotspot.tolist()) if hot
+            )
         
-        for node, _ in sorted_nodes[:hotspot_count]:
-            for edge in self.graph[node]:
-                to_node = edge["to"]
-                if random.random() < 0.3:  # 30% chance each edge is a hotspot
-                    self.congestion_points.append((node, to_node))
+        self._hotspot_ids = np.unique(
+            np.array([self.edge_id[edge] for edge in self.congestion_points], dtype=np.int64)
+        )
+        
+    def _next_event_draws(self) -> Tuple[float, float]:
+        """Next (accident, blockage) uniform draw pair, drawn 30 ticks at a time"""
+        if self._event_draw_pos >= len(self._event_draws):
+            self._event_draws = [tuple(pair) for pair in np.random.random((30, 2)).tolist()]
+            self._event_draw_pos = 0
+        draws = self._event_draws[self._event_draw_pos]
+        self._event_draw_pos += 1
+        return draws
         
     def _initialize_traffic_multipliers(self):
         """Initialize traffic multipliers for all edges"""
         for node in self.graph:
             for edge in self.graph[node]:
-                to_node = edge["to"]
-                self.traffic_multipliers[(node, to_node)] = config.DEFAULT_TRAFFIC_MULTIPLIER
+                self.edge_id.setdefault((node, edge["to"]), len(self.edge_id))
+        self._edge_str_keys = [f"{u},{v}" for (u, v) in self.edge_id]
+        
+        self.tm_arr = np.full(len(self.edge_id), config.DEFAULT_TRAFFIC_MULTIPLIER, dtype=np.float64)
+        self.traffic_multipliers = EdgeMultiplierView(self.edge_id, self.tm_arr)
+        # Moving average of tm_arr: the multipliers are re-sampled every tick, so the routing
+        # tables are built on (and checked for drift against) this instead of one noisy sample
+        self.tm_smoothed = self.tm_arr.copy()
+    
+    def _build_routing_tables(self, modes: Optional[List[str]] = None):
+        """
+        Build next-hop routing tables by running Dijkstra from every node.
+        Routing a vehicle then becomes a walk over table lookups instead of an A* search.
+        
+        Args:
+            modes: Travel modes to (re)build (all vehicle modes if None)
+        """
+        if modes is None:
+            modes = [v_type.value for v_type in VehicleType]
+        
+        # Plain dict snapshot for the Dijkstra runs (faster than going through the array view)
+        multipliers = dict(zip(self.edge_id, self.tm_smoothed.tolist()))
+            
+        for mode in modes:
+            next_hop = {}
+            route_dist = {}
+            for node in self.graph:
+                route_dist[node], next_hop[node] = pathfinder.dijkstra_next_hops(
+                    self.graph, multipliers, node, mode
+                )
+            self.next_hop[mode] = next_hop
+            self.route_dist[mode] = route_dist
+            self._route_snapshot[mode] = self.tm_smoothed.copy()
+            self._traffic_version += 1
+            self._mode_edges[mode] = np.array(sorted({
+                self.edge_id[(node, edge["to"])]
+                for node in self.graph
+                for edge in self.graph[node]
+                if mode in edge["allowed"]
+            }), dtype=np.int64)
+            self.dirty_modes.discard(mode)
+        self._routes_built_step = self.simulation_step
+    
+    def _flag_drifted_modes(self):
+        """
+        Mark modes whose routing tables were built on multipliers that have since drifted:
+        a share of the mode's edges (ROUTE_TABLE_DRIFT_SHARE) whose smoothed multiplier
+        moved by ROUTE_TABLE_DRIFT_THRESHOLD or more since the table was built.
+        """
+        threshold = config.ROUTE_TABLE_DRIFT_THRESHOLD
+        for mode, snapshot in self._route_snapshot.items():
+            if mode in self.dirty_modes:
+                continue
+            edge_ids = self._mode_edges[mode]
+            built = snapshot[edge_ids]
+            drifted = np.count_nonzero(np.abs(self.tm_smoothed[edge_ids] - built) > threshold * built)
+            if drifted >= config.ROUTE_TABLE_DRIFT_SHARE * len(edge_ids):
+                self.dirty_modes.add(mode)
+    
+    def _lookup_path(self, mode: str, start_node: str, goal_node: str) -> Tuple[Optional[List[str]], float]:
+        """
+        Look up a route in the precomputed next-hop table for a travel mode.
+        Falls back to a live A* search if the cached route crosses a blocked road.
+        
+        Args:
+            mode: Travel mode (vehicle type value)
+            start_node: Starting node
+            goal_node: Destination node
+            
+        Returns:
+            Tuple of (path, cost), or (None, inf) if the goal is unreachable
+        """
+        next_hop = self.next_hop[mode]
+        route_dist = self.route_dist[mode][start_node]
+        if goal_node not in route_dist:
+            return None, float("inf")
+            
+        path = [start_node]
+        node = start_node
+        while node != goal_node:
+            node = next_hop[node][goal_node]
+            if (path[-1], node) in self.blocked_roads:
+                return self._find_live_path(mode, start_node, goal_node)
+            path.append(node)
+            
+        return path, route_dist[goal_node]
+    
+    def _find_live_path(self, mode: str, start_node: str, goal_node: str) -> Tuple[Optional[List[str]], float]:
+        """Run A* on the live traffic state, avoiding blocked roads"""
+        return pathfinder.a_star(
+            self.graph,
+            self.heuristic_coords,
+            self.traffic_multipliers,
+            start_node,
+            goal_node,
+            mode,
+            blocked_roads=set(self.blocked_roads.keys()),
+            landmarks=self.get_landmark_tables()
+        )
+    
+    def _precompute_landmarks(self, k: int = 16):
+        """
+        Pick up to k landmarks farthest-first and store lower-bound distances
+        to and from each of them for the ALT heuristic used by A*.
+        
+        Args:
+            k: Number of landmarks
+        """
+        self.landmarks = []
+        self.landmark_dist = {node: [] for node in self.graph}
+        self.landmark_dist_to = {node: [] for node in self.graph}
+        if len(self._node_list) < config.ALT_MIN_NODES:
+            return  # small graph - A* uses the euclidean heuristic
+            
+        # Distance from the nearest chosen landmark; unreachable nodes count as farthest
+        nearest = {node: float("inf") for node in self._node_list}
+        landmark = self._node_list[0]
+        for _ in range(min(k, len(self._node_list))):
+            dist_from, dist_to = pathfinder.landmark_distances(self.graph, landmark)
+            self.landmarks.append(landmark)
+            for node in self._node_list:
+                d_from = dist_from.get(node, float("inf"))
+                self.landmark_dist[node].append(d_from)
+                self.landmark_dist_to[node].append(dist_to.get(node, float("inf")))
+                nearest[node] = min(nearest[node], d_from, dist_to.get(node, float("inf")))
+            nearest[landmark] = 0.0
+            
+            landmark = max(nearest, key=nearest.get)
+            if nearest[landmark] == 0.0:
+                break  # every node is already a landmark
+                
+    def get_landmark_tables(self) -> Optional[Tuple[Dict[str, List[float]], Dict[str, List[float]]]]:
+        """Landmark distance tables in the form pathfinder.a_star expects (None on small graphs)"""
+        if not self.landmarks:
+            return None
+        return self.landmark_dist, self.landmark_dist_to
     
     def _create_statistical_accident(self, from_node: Optional[str] = None, to_node: Optional[str] = None) -> Optional[dict]:
         """
@@ -152,7 +399,7 @@ class MultiVehicleSimulator:
         """
         if from_node is None or to_node is None:
             # Pick random edge
-            nodes = list(self.graph.keys())
+            nodes = self._node_list
             if not nodes:
                 return None
             from_node = random.choice(nodes)
@@ -170,13 +417,11 @@ class MultiVehicleSimulator:
         duration_params = accident_params.get("duration_minutes", {"mean": 45, "std_dev": 20, "min": 10, "max": 120})
         
         # Sample severity based on distribution (70% minor, 25% moderate, 5% severe)
-        rand = random.random()
-        if rand < severity_dist.get("minor", 0.70):
-            severity = "minor"
-        elif rand < severity_dist.get("minor", 0.70) + severity_dist.get("moderate", 0.25):
-            severity = "moderate"
-        else:
-            severity = "severe"
+        minor_prob = severity_dist.get("minor", 0.70)
+        severity = random.choices(
+            _SEVERITY_CHOICES,
+            cum_weights=(minor_prob, minor_prob + severity_dist.get("moderate", 0.25), 1.0)
+        )[0]
         
         # Sample duration from normal distribution (mean: 45 min, std: 20 min)
         duration_minutes = random.gauss(duration_params.get("mean", 45), duration_params.get("std_dev", 20))
@@ -193,10 +438,11 @@ class MultiVehicleSimulator:
         }
         
         self.accidents[accident_id] = accident
+        heapq.heappush(self._accident_expiry, (accident["created_at"] + duration_seconds, accident_id))
         
         # Partially block the road based on severity
-        severity_multipliers = {"minor": 2.0, "moderate": 4.0, "severe": 10.0}
-        self.traffic_multipliers[(from_node, to_node)] *= severity_multipliers[severity]
+        self.tm_arr[self.edge_id[(from_node, to_node)]] *= _SEVERITY_MULT[severity]
+        self._traffic_version += 1
         
         return accident
     
@@ -223,9 +469,11 @@ class MultiVehicleSimulator:
         from_node = accident["from_node"]
         to_node = accident["to_node"]
         
-        # Restore normal traffic
-        severity_multipliers = {"minor": 2.0, "moderate": 4.0, "severe": 10.0}
-        self.traffic_multipliers[(from_node, to_node)] /= severity_multipliers[accident["severity"]]
+        # Restore normal traffic (the multiplier may have been resampled since the accident,
+        # so never let it drop below the minimum the landmark bounds assume)
+        edge = self.edge_id[(from_node, to_node)]
+        self.tm_arr[edge] = max(config.MIN_TRAFFIC_MULTIPLIER, self.tm_arr[edge] / _SEVERITY_MULT[accident["severity"]])
+        self._traffic_version += 1
         
         del self.accidents[accident_id]
         return True
@@ -239,7 +487,7 @@ class MultiVehicleSimulator:
             Blockage data or None
         """
         # Pick random edge
-        nodes = list(self.graph.keys())
+        nodes = self._node_list
         if not nodes:
             return None
         from_node = random.choice(nodes)
@@ -273,7 +521,9 @@ class MultiVehicleSimulator:
         }
         
         # Make road extremely slow (effectively blocked)
-        self.traffic_multipliers[edge] = 100.0
+        self.tm_arr[self.edge_id[edge]] = 100.0
+        self.edge_blocked[self.edge_id[edge]] = True
+        self._traffic_version += 1
         return self.blocked_roads[edge]
     
     def block_road(self, from_node: str, to_node: str, reason: str = "construction") -> bool:
@@ -289,7 +539,7 @@ class MultiVehicleSimulator:
             True if successful
         """
         edge = (from_node, to_node)
-        if edge not in self.traffic_multipliers:
+        if edge not in self.edge_id:
             return False
         
         self.blocked_roads[edge] = {
@@ -300,7 +550,9 @@ class MultiVehicleSimulator:
         }
         
         # Make road extremely slow (effectively blocked)
-        self.traffic_multipliers[edge] = 100.0
+        self.tm_arr[self.edge_id[edge]] = 100.0
+        self.edge_blocked[self.edge_id[edge]] = True
+        self._traffic_version += 1
         return True
     
     def unblock_road(self, from_node: str, to_node: str) -> bool:
@@ -310,7 +562,9 @@ class MultiVehicleSimulator:
             return False
         
         del self.blocked_roads[edge]
-        self.traffic_multipliers[edge] = config.DEFAULT_TRAFFIC_MULTIPLIER
+        self.tm_arr[self.edge_id[edge]] = config.DEFAULT_TRAFFIC_MULTIPLIER
+        self.edge_blocked[self.edge_id[edge]] = False
+        self._traffic_version += 1
         return True
     
     def get_elapsed_time(self) -> float:
@@ -335,43 +589,36 @@ class MultiVehicleSimulator:
             Spawned vehicle or None if failed
         """
         # Get random nodes if not specified
-        nodes = list(self.graph.keys())
+        nodes = self._node_list
+        node_count = len(nodes)
         if not nodes:
             return None
             
         if start_node is None:
-            start_node = random.choice(nodes)
+            start_node = nodes[np.random.randint(node_count)]
             
         if goal_node is None:
-            # Pick a different node as goal
-            available_goals = [n for n in nodes if n != start_node]
-            if not available_goals:
+            # Pick a different node as goal (uniformly among the other nodes)
+            if node_count < 2:
                 return None
-            goal_node = random.choice(available_goals)
+            goal_index = np.random.randint(node_count - 1)
+            if goal_index >= self.node_index.get(start_node, node_count):
+                goal_index += 1
+            goal_node = nodes[goal_index]
             
-        # Create vehicle
-        vehicle = Vehicle(vehicle_type, start_node, goal_node)
-        
-        # Calculate initial path (avoiding blocked roads)
+        # Look up initial path (avoiding blocked roads)
         mode = vehicle_type.value
-        path, cost = pathfinder.a_star(
-            self.graph,
-            self.heuristic_coords,
-            self.traffic_multipliers,
-            start_node,
-            goal_node,
-            mode,
-            blocked_roads=set(self.blocked_roads.keys())
-        )
-        
-        if path:
-            vehicle.set_path(path, cost)
-            self.vehicle_manager.add_vehicle(vehicle)
-            self.total_spawned += 1
-            return vehicle
-        else:
+        path, cost = self._lookup_path(mode, start_node, goal_node)
+        if not path:
             return None
             
+        # Create vehicle (recycled from the manager's pool when possible)
+        vehicle = self.vehicle_manager.acquire(vehicle_type, start_node, goal_node)
+        vehicle.set_path(path, cost)
+        self.vehicle_manager.add_vehicle(vehicle)
+        self.total_spawned += 1
+        return vehicle
+            
     def spawn_random_vehicles(self, count: int, distribution: Optional[Dict[str, float]] = None):
         """
         Spawn multiple random vehicles with specified distribution.
@@ -385,25 +632,54 @@ class MultiVehicleSimulator:
             distribution = TrafficConfig.get_vehicle_distribution()
             
         spawned = []
+        node_count = len(self._node_list)
+        if count <= 0 or node_count < 2:
+            return spawned
         
-        for _ in range(count):
-            # Select vehicle type based on distribution
-            rand = random.random()
-            cumulative = 0
-            vehicle_type = VehicleType.CAR
-            
-            for v_type, prob in distribution.items():
-                cumulative += prob
-                if rand <= cumulative:
-                    vehicle_type = VehicleType(v_type)
-                    break
-                    
-            vehicle = self.spawn_vehicle(vehicle_type)
+        # Batch-sample start/goal pairs, redrawing the goal of any pair that starts where it ends
+        pair_index = np.random.randint(node_count, size=(count, 2))
+        same = pair_index[:, 0] == pair_index[:, 1]
+        pair_index[same, 1] = (pair_index[same, 0] + np.random.randint(1, node_count, size=int(same.sum()))) % node_count
+        node_pairs = self._node_arr[pair_index].tolist()
+        
+        # Select vehicle types based on distribution (one batched draw)
+        vehicle_types = self._sample_vehicle_types(distribution, count)
+        
+        for vehicle_type, (start_node, goal_node) in zip(vehicle_types, node_pairs):
+            vehicle = self.spawn_vehicle(vehicle_type, start_node, goal_node)
             if vehicle:
                 spawned.append(vehicle)
                 
         return spawned
     
+    def _sample_vehicle_types(self, distribution: Dict[str, float], count: int) -> List[VehicleType]:
+        """
+        Draw vehicle types from a type -> probability distribution.
+        The cumulative table is cached per distribution, so each draw is a bisect.
+        Probability mass the distribution leaves unassigned goes to cars.
+        
+        Args:
+            distribution: Probability of each vehicle type
+            count: Number of types to draw
+            
+        Returns:
+            List of sampled vehicle types
+        """
+        key = tuple(distribution.items())
+        if key != self._dist_key:
+            types = []
+            cum_weights = []
+            cumulative = 0.0
+            for v_type, prob in distribution.items():
+                cumulative += prob
+                types.append(VehicleType(v_type))
+                cum_weights.append(min(cumulative, 1.0))
+            types.append(VehicleType.CAR)
+            cum_weights.append(1.0)
+            self._dist_key, self._dist_types, self._dist_cum = key, types, cum_weights
+            
+        return random.choices(self._dist_types, cum_weights=self._dist_cum, k=count)
+    
     def _auto_spawn_vehicles(self, current_time: float, is_peak_hour: bool):
         """
         Automatically spawn vehicles based on statistical spawn rate from real dataset.
@@ -438,15 +714,7 @@ class MultiVehicleSimulator:
             distribution = TrafficConfig.get_vehicle_distribution(sim_hour)
             
             # Select vehicle type based on distribution
-            rand = random.random()
-            cumulative = 0
-            vehicle_type = VehicleType.CAR
-            
-            for v_type, prob in distribution.items():
-                cumulative += prob
-                if rand <= cumulative:
-                    vehicle_type = VehicleType(v_type)
-                    break
+            vehicle_type = self._sample_vehicle_types(distribution, 1)[0]
             
             # Spawn the vehicle
             vehicle = self.spawn_vehicle(vehicle_type)
@@ -494,10 +762,9 @@ class MultiVehicleSimulator:
             return False
         
         # CRITICAL: Check if current edge (the one vehicle is on) is blocked
-        if vehicle.next_node:
-            current_edge = (vehicle.current_node, vehicle.next_node)
-            if current_edge in self.blocked_roads:
-                return True
+        current_edge = vehicle.get_current_edge()
+        if current_edge and current_edge in self.blocked_roads:
+            return True
             
         # Check congestion probability on upcoming edges
         upcoming_edges = []
@@ -527,15 +794,16 @@ class MultiVehicleSimulator:
             vehicle: Vehicle to reroute
         """
         mode = vehicle.type.value
-        new_path, new_cost = pathfinder.a_star(
-            self.graph,
-            self.heuristic_coords,
-            self.traffic_multipliers,
-            vehicle.current_node,
-            vehicle.goal_node,
-            mode,
-            blocked_roads=set(self.blocked_roads.keys())
-        )
+        epoch = (self.simulation_step // 20, self._traffic_version)
+        if epoch != self._path_cache_epoch:
+            self._path_cache.clear()
+            self._path_cache_epoch = epoch
+            
+        key = (vehicle.current_node, vehicle.goal_node, mode)
+        cached = self._path_cache.get(key)
+        if cached is None:
+            cached = self._path_cache[key] = self._lookup_path(mode, vehicle.current_node, vehicle.goal_node)
+        new_path, new_cost = cached
         
         if new_path and new_path != vehicle.path[vehicle.path_index:]:
             vehicle.set_path(new_path, new_cost)
@@ -553,6 +821,39 @@ class MultiVehicleSimulator:
             vehicle.status = VehicleStatus.STUCK
             # Don't clear next_node - keep it so we know vehicle is stuck on this edge
     
+    def _index_vehicle_positions(self):
+        """
+        Rebuild the vehicle spatial grid from the vehicles' current positions.
+        Each vehicle on a road sits between the ends of its edge at position_on_edge.
+        The grid holds store slots, which stay valid until the manager's version changes.
+        """
+        manager = self.vehicle_manager
+        lanes = manager.road_lanes()
+        edge_nodes = self._edge_nodes[manager.store.edge_id[lanes]]
+        start = self._node_xy[edge_nodes[:, 0]]
+        end = self._node_xy[edge_nodes[:, 1]]
+        xy = start + (end - start) * manager.store.position_on_edge[lanes, None]
+        self._grid.rebuild(lanes, xy[:, 0], xy[:, 1])
+        self._grid_stamp = (self.simulation_step, manager.version)
+        
+    def get_vehicles_near(self, x: float, y: float, radius: float) -> List[Vehicle]:
+        """
+        Find vehicles within a radius of a point, using positions from the last tick.
+        
+        Args:
+            x: X coordinate (map units, as in heuristic_coords)
+            y: Y coordinate
+            radius: Search radius in map units
+            
+        Returns:
+            Vehicles on a road within the radius
+        """
+        manager = self.vehicle_manager
+        if self._grid_stamp != (self.simulation_step, manager.version):
+            self._index_vehicle_positions()
+        slot_vehicles = manager.slot_vehicles
+        return [slot_vehicles[slot] for slot in self._grid.query_radius(x, y, radius)]
+    
     def _check_stuck_vehicles(self):
         """
         Periodically check if stuck vehicles can move again.
@@ -564,15 +865,7 @@ class MultiVehicleSimulator:
         for vehicle in stuck_vehicles:
             # Try to find a new path
             mode = vehicle.type.value
-            new_path, new_cost = pathfinder.a_star(
-                self.graph,
-                self.heuristic_coords,
-                self.traffic_multipliers,
-                vehicle.current_node,
-                vehicle.goal_node,
-                mode,
-                blocked_roads=set(self.blocked_roads.keys())
-            )
+            new_path, new_cost = self._find_live_path(mode, vehicle.current_node, vehicle.goal_node)
             
             if new_path:
                 # Path found! Unfreeze vehicle
@@ -595,12 +888,18 @@ class MultiVehicleSimulator:
         delta_time = current_time - self.last_update_time
         self.last_update_time = current_time
         
-        # Cap delta time to prevent huge jumps
-        delta_time = min(delta_time, 0.2)  # Max 200ms
+        # Cap delta time to prevent huge jumps (and backwards steps if the wall clock is adjusted)
+        delta_time = max(0.0, min(delta_time, 0.2))  # Max 200ms
+        self.vehicle_manager.current_time += delta_time
         
         self.simulation_step += 1
         elapsed_time = self.get_elapsed_time()
         
+        # Rebuild routing tables invalidated by traffic drift (rate-limited; blocked
+        # roads are still honoured in between through the live A* fallback)
+        if self.dirty_modes and self.simulation_step - self._routes_built_step >= config.ROUTE_TABLE_REBUILD_INTERVAL:
+            self._build_routing_tables(list(self.dirty_modes))
+        
         # Get congestion params from real dataset
         congestion_params = TrafficConfig.get_congestion_params()
         
@@ -625,21 +924,21 @@ class MultiVehicleSimulator:
         accidents_per_hour = accident_params.get("rate_per_hour", 5)
         # Convert to per-tick probability (assuming ~20 ticks per second)
         accident_prob_per_tick = accidents_per_hour / 3600.0 / 20.0
-        if random.random() < accident_prob_per_tick:
+        accident_draw, blockage_draw = self._next_event_draws()
+        if accident_draw < accident_prob_per_tick:
             self._create_statistical_accident()
         
         # Blockage generation based on real dataset (3 blockages per hour)
         blockage_params = TrafficConfig.get_blockage_params()
         blockages_per_hour = blockage_params.get("rate_per_hour", 3)
         blockage_prob_per_tick = blockages_per_hour / 3600.0 / 20.0
-        if random.random() < blockage_prob_per_tick:
+        if blockage_draw < blockage_prob_per_tick:
             self._create_statistical_blockage()
         
-        # Auto-resolve old accidents
-        for accident_id in list(self.accidents.keys()):
-            accident = self.accidents[accident_id]
-            if current_time - accident["created_at"] > accident["duration"]:
-                self.resolve_accident(accident_id)
+        # Auto-resolve old accidents (entries for accidents already resolved by hand are skipped)
+        while self._accident_expiry and self._accident_expiry[0][0] < current_time:
+            _, accident_id = heapq.heappop(self._accident_expiry)
+            self.resolve_accident(accident_id)
         
         # Auto-resolve old blockages (based on duration)
         for edge in list(self.blocked_roads.keys()):
@@ -656,105 +955,41 @@ class MultiVehicleSimulator:
         # Update traffic based on current vehicle positions and time
         self.traffic_analyzer.update_traffic_multipliers(self.traffic_multipliers)
         
-        # Apply time-based congestion on hotspots
-        for edge in self.congestion_points:
-            if edge in self.traffic_multipliers and congestion_factor > 0.3:
-                # Gradually increase congestion on hotspots
-                base_multiplier = self.traffic_multipliers[edge]
-                time_penalty = 1.0 + (congestion_factor * random.uniform(0.5, 2.0))
-                self.traffic_multipliers[edge] = min(base_multiplier * time_penalty, 5.0)
+        # Apply time-based congestion on hotspots (one batched draw for all of them)
+        if congestion_factor > 0.3 and len(self._hotspot_ids):
+            hotspots = self._hotspot_ids
+            time_penalty = 1.0 + congestion_factor * np.random.uniform(0.5, 2.0, size=len(hotspots))
+            self.tm_arr[hotspots] = np.minimum(self.tm_arr[hotspots] * time_penalty, 5.0)
+        
+        # Fold this tick's multipliers into the moving average, then invalidate
+        # routing tables whose multipliers drifted too far
+        self.tm_smoothed += config.ROUTE_TABLE_SMOOTHING * (self.tm_arr - self.tm_smoothed)
+        self._flag_drifted_modes()
         
         # Get all active vehicles
         active_vehicles = self.vehicle_manager.get_active_vehicles()
         moved = 0
         arrived = 0
         
-        # First pass: Check for vehicles ahead and adjust speeds
+        # First pass: vehicles on a blocked road MUST reroute immediately
+        # (if the reroute fails the vehicle is frozen and the kernels leave it alone)
         for vehicle in active_vehicles:
             if vehicle.status == VehicleStatus.ARRIVED or not vehicle.next_node:
                 continue
-            
-            edge = (vehicle.current_node, vehicle.next_node)
-            
-            # Check if road is blocked - MUST reroute immediately
-            if edge in self.blocked_roads:
-                # Force immediate reroute
+            if vehicle.get_current_edge() in self.blocked_roads:
                 self._reroute_vehicle(vehicle)
-                # If reroute failed, vehicle is now frozen - skip further processing
-                continue
-            
-            # If vehicle was frozen due to blocked road but road is now clear, unfreeze
-            if vehicle.status == VehicleStatus.STUCK and vehicle.current_speed == 0.0 and vehicle.target_speed == 0.0:
-                # Road is not blocked, so this was a traffic stop - unfreeze and recalculate
-                vehicle.target_speed = vehicle.speed_multiplier
-                vehicle.status = VehicleStatus.MOVING
-                
-            vehicles_on_edge = self.vehicle_manager.get_vehicles_on_edge(
-                vehicle.current_node, vehicle.next_node
-            )
-            
-            # Find vehicle directly ahead on same edge
-            ahead_vehicle = None
-            min_distance = float('inf')
-            
-            for other_id in vehicles_on_edge:
-                if other_id == vehicle.id:
-                    continue
-                other = self.vehicle_manager.get_vehicle(other_id)
-                if not other:
-                    continue
-                    
-                # Check if other vehicle is ahead
-                if other.position_on_edge > vehicle.position_on_edge:
-                    distance = other.position_on_edge - vehicle.position_on_edge
-                    edge_length = self.edge_lengths.get(edge, 100.0)
-                    pixel_distance = distance * edge_length
-                    
-                    if pixel_distance < min_distance:
-                        min_distance = pixel_distance
-                        ahead_vehicle = other
-            
-            # Adjust speed based on vehicle ahead
-            if ahead_vehicle:
-                vehicle.slow_down_for_vehicle_ahead(min_distance)
-            else:
-                # No vehicle ahead, resume normal speed
-                vehicle.target_speed = vehicle.speed_multiplier
-                if vehicle.status == VehicleStatus.STUCK:
-                    vehicle.status = VehicleStatus.MOVING
         
-        # Second pass: Update positions
-        for vehicle in active_vehicles:
-            if vehicle.status == VehicleStatus.ARRIVED or not vehicle.next_node:
-                continue
-            
-            edge = (vehicle.current_node, vehicle.next_node)
-            
-            # Skip vehicles frozen due to blocked roads (checked via periodic recheck)
-            if edge in self.blocked_roads and vehicle.current_speed == 0.0:
-                continue
-            
-            # Double-check: Don't allow movement on blocked edges
-            if edge in self.blocked_roads:
-                vehicle.target_speed = 0.0
-                vehicle.status = VehicleStatus.STUCK
-                continue
-                
-            edge_length = self.edge_lengths.get(edge, 100.0)
-            
-            # Update physics-based position
-            reached_end = vehicle.update_position(delta_time, edge_length)
-            
-            if reached_end:
-                # Move to next node on path
-                success = vehicle.move_to_next_node()
-                if success:
-                    moved += 1
-                if vehicle.status == VehicleStatus.ARRIVED:
-                    arrived += 1
-                    
-        # Update edge occupancy
-        self.vehicle_manager.update_edge_occupancy()
+        # Second pass: physics for every vehicle on a road, run over the manager's state
+        # arrays - slow down for the vehicle ahead on the same edge, then update positions
+        reached_end = self.vehicle_manager.tick(delta_time, self.edge_length_arr, self.edge_blocked)
+        
+        for vehicle in reached_end:
+            # Move to next node on path
+            success = vehicle.move_to_next_node()
+            if success:
+                moved += 1
+            if vehicle.status == VehicleStatus.ARRIVED:
+                arrived += 1
         
         return {
             "step": self.simulation_step,
@@ -802,13 +1037,13 @@ class MultiVehicleSimulator:
         Returns:
             Dictionary with all simulation data
         """
-        vehicles = [v.to_dict() for v in self.vehicle_manager.get_all_vehicles()]
+        vehicles = self.get_vehicles_json()
         vehicle_stats = self.vehicle_manager.get_statistics()
         traffic_stats = self.traffic_analyzer.get_global_statistics()
         edge_data = self.traffic_analyzer.get_edge_traffic_data()
         
         # Convert traffic multipliers to serializable format
-        traffic_dict = {f"{k[0]},{k[1]}": v for k, v in self.traffic_multipliers.items()}
+        traffic_dict = dict(zip(self._edge_str_keys, self.tm_arr.tolist()))
         
         return {
             "step": self.simulation_step,
@@ -822,18 +1057,31 @@ class MultiVehicleSimulator:
         }
         
     def get_vehicles_json(self) -> List[dict]:
-        """Get all vehicles as JSON-serializable list"""
-        return [v.to_dict() for v in self.vehicle_manager.get_all_vehicles()]
+        """Get all vehicles as JSON-serializable list (serialized at most once per tick)"""
+        stamp = (self.simulation_step, self.vehicle_manager.version)
+        if self._vehicles_json_cache[0] != stamp:
+            # Build the per-vehicle dicts from the columnar snapshot (same keys as Vehicle.to_dict)
+            columns = self.vehicle_manager.snapshot()
+            keys = tuple(columns)
+            self._vehicles_json_cache = (stamp, [dict(zip(keys, row)) for row in zip(*columns.values())])
+        return self._vehicles_json_cache[1]
+        
+    def get_vehicles_snapshot(self) -> Dict[str, list]:
+        """Get all vehicles in column form (one list per field, see VehicleManager.snapshot)"""
+        return self.vehicle_manager.snapshot()
         
     def get_traffic_multipliers_json(self) -> dict:
         """Get traffic multipliers in JSON-serializable format"""
-        return {f"{k[0]},{k[1]}": v for k, v in self.traffic_multipliers.items()}
+        return dict(zip(self._edge_str_keys, self.tm_arr.tolist()))
         
     def reset_simulation(self):
         """Reset the entire simulation to initial state"""
         self.vehicle_manager.reset()
-        self._initialize_traffic_multipliers()
+        # Restart the step count first so the rebuilt tables are stamped with step 0
         self.simulation_step = 0
+        self._initialize_traffic_multipliers()
+        self._build_routing_tables()
+        self._precompute_landmarks()
         self.is_running = False
         self.total_spawned = 0
         # Reset simulation time to start at 7 AM again
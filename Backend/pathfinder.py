@@ -6,9 +6,30 @@ import config
 def euclidean_distance(a, b):
     return math.sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2)
 
-def a_star(graph, heuristic_coords, traffic_multipliers, start, goal, mode, blocked_roads=None):
+def landmark_heuristic(landmarks, node, goal):
+    # ALT lower bound from the triangle inequality:
+    # d(node, goal) >= d(L, goal) - d(L, node) and d(node, goal) >= d(node, L) - d(goal, L)
+    # (inf - inf terms are nan and never win the comparison)
+    dist_from, dist_to = landmarks
+    best = 0.0
+    for d_lg, d_ln in zip(dist_from[goal], dist_from[node]):
+        if d_lg - d_ln > best:
+            best = d_lg - d_ln
+    for d_nl, d_gl in zip(dist_to[node], dist_to[goal]):
+        if d_nl - d_gl > best:
+            best = d_nl - d_gl
+    return best
+
+def a_star(graph, heuristic_coords, traffic_multipliers, start, goal, mode, blocked_roads=None, landmarks=None):
+    # landmarks: optional (dist_from, dist_to) tables from landmark_distances();
+    # when given they replace the euclidean heuristic
     if blocked_roads is None:
         blocked_roads = set()
+
+    if landmarks is not None:
+        heuristic = lambda node: landmark_heuristic(landmarks, node, goal)
+    else:
+        heuristic = lambda node: euclidean_distance(heuristic_coords[node], heuristic_coords[goal])
     
     open_set = []
     heapq.heappush(open_set, (0, start))
@@ -17,7 +38,7 @@ def a_star(graph, heuristic_coords, traffic_multipliers, start, goal, mode, bloc
     g_score[start] = 0
 
     f_score = {node: float("inf") for node in graph}
-    f_score[start] = euclidean_distance(heuristic_coords[start], heuristic_coords[goal])
+    f_score[start] = heuristic(start)
 
     while open_set:
         current_f, current = heapq.heappop(open_set)
@@ -50,7 +71,70 @@ def a_star(graph, heuristic_coords, traffic_multipliers, start, goal, mode, bloc
             if tentative_g < g_score[neighbor]:
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + euclidean_distance(heuristic_coords[neighbor], heuristic_coords[goal])
+                f_score[neighbor] = tentative_g + heuristic(neighbor)
                 heapq.heappush(open_set, (f_score[neighbor], neighbor))
 
-    return None, float("inf")  # no path found
\ No newline at end of file
+    return None, float("inf")  # no path found
+
+def dijkstra_next_hops(graph, traffic_multipliers, source, mode):
+    # single-source Dijkstra that records, for every reachable node, the first
+    # hop out of `source` on its shortest path (used to build routing tables)
+    dist = {source: 0}
+    first_hop = {}
+    visited = set()
+    open_set = [(0, source)]
+
+    while open_set:
+        current_d, current = heapq.heappop(open_set)
+        if current in visited:
+            continue
+        visited.add(current)
+
+        for edge in graph[current]:
+            if mode not in edge["allowed"]:
+                continue
+
+            neighbor = edge["to"]
+            multiplier = traffic_multipliers.get((current, neighbor), config.DEFAULT_TRAFFIC_MULTIPLIER)
+            tentative_d = current_d + edge["distance"] * multiplier
+
+            if tentative_d < dist.get(neighbor, float("inf")):
+                dist[neighbor] = tentative_d
+                first_hop[neighbor] = neighbor if current == source else first_hop[current]
+                heapq.heappush(open_set, (tentative_d, neighbor))
+
+    return dist, first_hop
+
+def _shortest_distances(adjacency, source):
+    # plain single-source Dijkstra over {node: [(neighbor, weight), ...]}
+    dist = {source: 0.0}
+    visited = set()
+    open_set = [(0.0, source)]
+
+    while open_set:
+        current_d, current = heapq.heappop(open_set)
+        if current in visited:
+            continue
+        visited.add(current)
+
+        for neighbor, weight in adjacency[current]:
+            tentative_d = current_d + weight
+            if tentative_d < dist.get(neighbor, float("inf")):
+                dist[neighbor] = tentative_d
+                heapq.heappush(open_set, (tentative_d, neighbor))
+
+    return dist
+
+def landmark_distances(graph, landmark):
+    # distances from and to a landmark over every edge (any mode) weighted by
+    # MIN_TRAFFIC_MULTIPLIER, so they are lower bounds as long as no live multiplier
+    # drops below it (the simulator clamps at that floor)
+    forward = {node: [] for node in graph}
+    reverse = {node: [] for node in graph}
+    for node in graph:
+        for edge in graph[node]:
+            weight = edge["distance"] * config.MIN_TRAFFIC_MULTIPLIER
+            forward[node].append((edge["to"], weight))
+            reverse.setdefault(edge["to"], []).append((node, weight))
+
+    return _shortest_distances(forward, landmark), _shortest_distances(reverse, landmark)
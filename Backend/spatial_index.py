@@ -0,0 +1,101 @@
+# spatial_index.py
+# Uniform grid for radius queries over vehicle positions
+# Built in bulk from a snapshot of positions instead of being updated as vehicles move
+
+from typing import Dict, List, Tuple
+import itertools
+import math
+import numpy as np
+
+
+class VehicleSpatialGrid:
+    """
+    Uniform grid (spatial hash) over point positions.
+    Each point goes into the square cell containing it; a radius query only looks
+    at the cells overlapping the query circle. Rebuilt in bulk, with the points
+    grouped per cell by one sort.
+    """
+
+    def __init__(self, cell_size: float):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size: Side length of a cell (same units as the coordinates)
+        """
+        self.cell_size = float(cell_size)
+        self.items: List = []
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}  # (cell x, cell y) -> point indices
+
+    def rebuild(self, items: List, xs: np.ndarray, ys: np.ndarray):
+        """
+        Replace the grid contents with a new set of points.
+
+        Args:
+            items: Payload for each point, a list or array (returned by queries)
+            xs: X coordinate of each point
+            ys: Y coordinate of each point
+        """
+        self.items = items
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        cell_x = np.floor(self.xs / self.cell_size).astype(np.int64)
+        cell_y = np.floor(self.ys / self.cell_size).astype(np.int64)
+
+        # Sort by cell, then cut the order wherever the cell changes
+        order = np.lexsort((cell_y, cell_x))
+        cell_x = cell_x[order]
+        cell_y = cell_y[order]
+        cuts = np.flatnonzero((cell_x[1:] != cell_x[:-1]) | (cell_y[1:] != cell_y[:-1])) + 1
+        starts = np.concatenate(([0], cuts)) if len(order) else cuts
+        self._cells = dict(zip(
+            zip(cell_x[starts].tolist(), cell_y[starts].tolist()),
+            np.split(order, cuts)
+        ))
+
+    def query_radius(self, x: float, y: float, radius: float) -> List:
+        """
+        Find all points within `radius` of (x, y).
+
+        Args:
+            x: Query X coordinate
+            y: Query Y coordinate
+            radius: Search radius (same units as the coordinates)
+
+        Returns:
+            Items whose points lie within the radius
+        """
+        if not self._cells:
+            return []
+
+        size = self.cell_size
+        min_cx, max_cx = math.floor((x - radius) / size), math.floor((x + radius) / size)
+        min_cy, max_cy = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self._cells):
+            # The circle covers more cells than are occupied - check the occupied ones
+            candidates = [idx for (cx, cy), idx in self._cells.items()
+                          if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy]
+        else:
+            cells = self._cells
+            candidates = [cells[cell] for cell in itertools.product(range(min_cx, max_cx + 1), range(min_cy, max_cy + 1))
+                          if cell in cells]
+        if not candidates:
+            return []
+
+        idx = np.concatenate(candidates)
+        dist2 = (self.xs[idx] - x) ** 2 + (self.ys[idx] - y) ** 2
+        return [self.items[i] for i in idx[dist2 <= radius * radius].tolist()]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def world_bounds(coords: Dict[str, Tuple[float, float]]) -> Tuple[float, float, float, float]:
+    """Bounding rectangle (min_x, min_y, max_x, max_y) of a node coordinate map"""
+    if not coords:
+        return (0.0, 0.0, 1.0, 1.0)
+    xs = [c[0] for c in coords.values()]
+    ys = [c[1] for c in coords.values()]
+    return (float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys)))
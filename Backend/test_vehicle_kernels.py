@@ -0,0 +1,170 @@
+# test_vehicle_kernels.py
+# Checks the vectorized/compiled physics step against the per-vehicle rules in Vehicle
+# Run from Backend/: python -m unittest test_vehicle_kernels (or pytest)
+
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import vehicle_kernels
+from vehicle import Vehicle, VehicleManager, VehicleStatus, VehicleType
+
+STATE_FIELDS = ("status", "current_speed", "target_speed", "position_on_edge")
+
+
+def build_scenario(seed: int, n_edges: int = 6, n_vehicles: int = 120):
+    """
+    Build a manager with vehicles spread over a few edges in mixed states.
+    Positions are drawn from a coarse grid so several vehicles share a position.
+
+    Returns:
+        (manager, edge_length_arr, edge_blocked)
+    """
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    edges = [(f"n{i}", f"n{i + 1}") for i in range(n_edges)]
+    manager = VehicleManager()
+    manager.set_edge_index({edge: i for i, edge in enumerate(edges)})
+    edge_length_arr = rng.uniform(40.0, 400.0, n_edges)
+    edge_blocked = np.zeros(n_edges, dtype=np.bool_)
+    edge_blocked[rng.choice(n_edges, 2, replace=False)] = True
+
+    vehicle_types = list(VehicleType)
+    for _ in range(n_vehicles):
+        u, v = edges[rng.integers(n_edges)]
+        vehicle = manager.acquire(vehicle_types[rng.integers(len(vehicle_types))], u, v)
+        vehicle.set_path([u, v])
+        manager.add_vehicle(vehicle)
+
+        vehicle.position_on_edge = float(rng.integers(0, 21)) / 20.0
+        vehicle.current_speed = float(rng.choice([0.0, 0.3, rng.uniform(0.0, 1.5) * vehicle.speed_multiplier]))
+        vehicle.target_speed = float(rng.choice([0.0, 0.5, vehicle.speed_multiplier]))
+        roll = rng.random()
+        if roll < 0.2:
+            vehicle.status = VehicleStatus.STUCK
+        elif roll < 0.3:
+            # Frozen: unfrozen by the speed control unless still too close to the vehicle ahead
+            vehicle.status = VehicleStatus.STUCK
+            vehicle.current_speed = vehicle.target_speed = 0.0
+        elif roll < 0.35:
+            vehicle.status = VehicleStatus.WAITING
+        elif roll < 0.4:
+            vehicle.status = VehicleStatus.ARRIVED
+    return manager, edge_length_arr, edge_blocked
+
+
+def reference_tick(vehicles, edge_ids, edge_length_arr, edge_blocked, delta_time):
+    """
+    One physics step with the original object-based two-pass loop.
+
+    Args:
+        vehicles: Standalone vehicles (not in a manager)
+        edge_ids: Edge id of each vehicle
+        edge_length_arr: Edge length in pixels by edge id
+        edge_blocked: Blocked flag by edge id
+        delta_time: Time elapsed since last tick (seconds)
+
+    Returns:
+        Indices (into vehicles) of the vehicles that reached the end of their edge
+    """
+    on_road = [i for i, v in enumerate(vehicles) if v.status != VehicleStatus.ARRIVED]
+    positions = [v.position_on_edge for v in vehicles]  # Everyone reacts to the same snapshot
+
+    for i in on_road:
+        vehicle, edge = vehicles[i], edge_ids[i]
+        if edge_blocked[edge]:
+            continue
+        if vehicle.status == VehicleStatus.STUCK and vehicle.current_speed == 0.0 and vehicle.target_speed == 0.0:
+            vehicle.target_speed = vehicle.speed_multiplier
+            vehicle.status = VehicleStatus.MOVING
+        gaps = [(positions[j] - positions[i]) * edge_length_arr[edge] for j in on_road
+                if j != i and edge_ids[j] == edge and positions[j] > positions[i]]
+        if gaps:
+            vehicle.slow_down_for_vehicle_ahead(min(gaps))
+        else:
+            vehicle.target_speed = vehicle.speed_multiplier
+            if vehicle.status == VehicleStatus.STUCK:
+                vehicle.status = VehicleStatus.MOVING
+
+    reached = []
+    for i in on_road:
+        vehicle, edge = vehicles[i], edge_ids[i]
+        if edge_blocked[edge]:
+            if vehicle.current_speed != 0.0:
+                vehicle.target_speed = 0.0
+                vehicle.status = VehicleStatus.STUCK
+            continue
+        if vehicle.update_position(delta_time, edge_length_arr[edge]):
+            reached.append(i)
+    return reached
+
+
+def fused_uncompiled(status, current_speed, target_speed, speed_multiplier, acceleration, position_on_edge,
+                     edge_id, lanes, edge_length_arr, edge_blocked, delta_time):
+    """The fused kernel run as plain Python (its per-lane helpers may still be compiled)"""
+    kernel = getattr(vehicle_kernels._tick_kernel, "py_func", vehicle_kernels._tick_kernel)
+    return kernel(status, current_speed, target_speed, speed_multiplier, acceleration, position_on_edge,
+                  edge_id, lanes, edge_length_arr, edge_blocked, delta_time,
+                  vehicle_kernels.MIN_FOLLOWING_DISTANCE)
+
+
+def numpy_fallback(*args):
+    """tick_lanes as it runs when Numba is not installed"""
+    with mock.patch.object(vehicle_kernels, "NUMBA_AVAILABLE", False):
+        return vehicle_kernels.tick_lanes(*args)
+
+
+class TickLanesMatchesReference(unittest.TestCase):
+    """Every tick_lanes implementation must match the per-vehicle rules exactly"""
+
+    STEPS = 8
+    DELTA_TIME = 0.25
+
+    def check(self, tick):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                self.check_scenario(tick, seed)
+
+    def check_scenario(self, tick, seed):
+        manager, edge_length_arr, edge_blocked = build_scenario(seed)
+        store = manager.store
+        n = store.size
+
+        # Standalone copies for the reference, with their own private stores
+        reference = []
+        for slot, vehicle in enumerate(manager.slot_vehicles):
+            copy = Vehicle(vehicle.type, vehicle.start_node, vehicle.goal_node)
+            copy._store.copy_slot(copy._slot, store, slot)
+            reference.append(copy)
+        edge_ids = store.edge_id[:n].tolist()
+
+        for step in range(self.STEPS):
+            lanes = manager.road_lanes()
+            reached_end = tick(
+                store.status, store.current_speed, store.target_speed, store.speed_multiplier,
+                store.acceleration, store.position_on_edge, store.edge_id, lanes,
+                edge_length_arr, edge_blocked, self.DELTA_TIME
+            )
+            expected = reference_tick(reference, edge_ids, edge_length_arr, edge_blocked, self.DELTA_TIME)
+
+            self.assertEqual(sorted(lanes[reached_end].tolist()), expected, f"reached_end, step {step}")
+            for name in STATE_FIELDS:
+                got = getattr(store, name)[:n]
+                want = np.array([getattr(v._store, name)[v._slot] for v in reference], dtype=got.dtype)
+                np.testing.assert_array_equal(got, want, f"{name}, step {step}")
+
+    @unittest.skipUnless(vehicle_kernels.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_compiled_kernel(self):
+        self.check(vehicle_kernels.tick_lanes)
+
+    def test_fused_kernel_uncompiled(self):
+        self.check(fused_uncompiled)
+
+    def test_numpy_fallback(self):
+        self.check(numpy_fallback)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,9 @@
 # Implements statistical models for realistic traffic patterns
 
 import random
-import math
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple
 from collections import defaultdict
-from vehicle import VehicleManager, Vehicle, VehicleType
+from vehicle import VehicleManager
 
 
 class TrafficAnalyzer:
@@ -45,6 +44,7 @@ class TrafficAnalyzer:
         self.vehicle_manager = vehicle_manager
         self.edge_capacities: Dict[Tuple[str, str], float] = {}
         self.congestion_history: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        self._edge_levels: Dict[Tuple[str, str], str] = {}  # Congestion level per edge, refreshed for dirty edges
         self._calculate_edge_capacities()
         
     def _calculate_edge_capacities(self):
@@ -110,13 +110,16 @@ class TrafficAnalyzer:
             Traffic multiplier (higher = slower)
         """
         level = self.get_congestion_level(from_node, to_node)
+        return self._sample_multiplier((from_node, to_node), level)
+        
+    def _sample_multiplier(self, edge: Tuple[str, str], level: str) -> float:
+        """Draw a multiplier for an edge at the given congestion level and record it in history"""
         min_mult, max_mult = self.TRAFFIC_RANGES[level]
         
         # Add some randomness for realism
         multiplier = random.uniform(min_mult, max_mult)
         
         # Record in history
-        edge = (from_node, to_node)
         self.congestion_history[edge].append(multiplier)
         if len(self.congestion_history[edge]) > 100:  # Keep last 100 samples
             self.congestion_history[edge].pop(0)
@@ -161,15 +164,20 @@ class TrafficAnalyzer:
         Args:
             traffic_multipliers: Dictionary to update with new multipliers
         """
-        # Update edge occupancy first
-        self.vehicle_manager.update_edge_occupancy()
+        # Congestion levels only change when vehicles enter or leave an edge, so
+        # refresh just those (or everything if most edges changed)
+        dirty = self.vehicle_manager.pop_dirty_edges()
+        if not self._edge_levels or len(dirty) > 0.5 * len(self.edge_capacities):
+            dirty = self.edge_capacities.keys()
+        for from_node, to_node in dirty:
+            self._edge_levels[(from_node, to_node)] = self.get_congestion_level(from_node, to_node)
         
         # Calculate multipliers for all edges
         for node in self.graph:
             for edge in self.graph[node]:
                 to_node = edge["to"]
-                multiplier = self.calculate_traffic_multiplier(node, to_node)
-                traffic_multipliers[(node, to_node)] = multiplier
+                key = (node, to_node)
+                traffic_multipliers[key] = self._sample_multiplier(key, self._edge_levels[key])
                 
     def find_bottlenecks(self, threshold: float = 0.7) -> List[Tuple[str, str, float]]:
         """
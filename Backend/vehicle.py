@@ -3,12 +3,17 @@
 # Uses object-oriented design and data structures for efficient vehicle management
 
 import random
-import time
 import json
+import math
 import os
+import itertools
 from enum import Enum
 from typing import List, Optional, Tuple, Dict
-from collections import deque
+from collections import deque, defaultdict
+import numpy as np
+from vehicle_kernels import (
+    STATUS_WAITING, STATUS_MOVING, STATUS_STUCK, STATUS_ARRIVED, STATUS_REROUTING, tick_lanes
+)
 
 
 class VehicleType(Enum):
@@ -27,6 +32,28 @@ class VehicleStatus(Enum):
     REROUTING = "rerouting"      # Calculating new path
 
 
+# Integer codes for VehicleStatus in the vehicle state arrays
+STATUS_CODES = {
+    VehicleStatus.WAITING: STATUS_WAITING,
+    VehicleStatus.MOVING: STATUS_MOVING,
+    VehicleStatus.STUCK: STATUS_STUCK,
+    VehicleStatus.ARRIVED: STATUS_ARRIVED,
+    VehicleStatus.REROUTING: STATUS_REROUTING
+}
+STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+_STATUS_VALUES = tuple(STATUS_BY_CODE[code].value for code in range(len(STATUS_BY_CODE)))
+
+# Integer codes for VehicleType in the vehicle state arrays
+TYPE_CODES = {
+    VehicleType.CAR: 0,
+    VehicleType.BIKE: 1,
+    VehicleType.PEDESTRIAN: 2
+}
+
+# Vehicle capacity (how much space they occupy on an edge), indexed by type code
+_CAPACITY_BY_TYPE = (1.0, 0.5, 0.2)
+
+
 class TrafficConfig:
     """
     Loads and provides access to real-world traffic statistics.
@@ -173,22 +200,121 @@ class TrafficConfig:
 # For visual purposes, we scale up: 1 km/h ≈ 1 pixel/sec
 KMH_TO_PIXELS_PER_SEC = 1.0
 
+# Source of unique vehicle ID numbers (next() on a count is atomic)
+_id_counter = itertools.count(1)
+
+
+class VehicleStore:
+    """
+    Structure-of-arrays storage for the numeric vehicle state.
+    Each vehicle owns one slot; the per-tick physics runs over whole arrays
+    instead of touching vehicles one attribute at a time.
+    """
+    
+    FIELDS = (
+        ("position_on_edge", np.float64),
+        ("current_speed", np.float64),
+        ("target_speed", np.float64),
+        ("acceleration", np.float64),
+        ("speed_multiplier", np.float64),
+        ("capacity_usage", np.float64),
+        ("wait_time", np.float64),
+        ("spawn_time", np.float64),
+        ("arrival_time", np.float64),  # NaN until the vehicle arrives
+        ("reroute_count", np.int32),
+        ("status", np.int8),
+        ("type_code", np.uint8),  # TYPE_CODES of the vehicle type
+        ("path_index", np.int32),
+        ("edge_id", np.int32)   # Edge the vehicle is on, -1 when not on a road
+    )
+    
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize an empty store.
+        
+        Args:
+            capacity: Initial number of slots (doubles when full)
+        """
+        self.size = 0
+        self.capacity = capacity
+        self.edge_index: Dict[Tuple[str, str], int] = {}  # Edge -> edge id used in edge_id
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        
+    def _grow(self, capacity: int):
+        """Reallocate every array with room for `capacity` slots, keeping the used ones"""
+        for name, dtype in self.FIELDS:
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.capacity = capacity
+        
+    def append(self) -> int:
+        """Claim a new slot at the end and return its index"""
+        if self.size == self.capacity:
+            self._grow(max(1, self.capacity * 2))
+        slot = self.size
+        self.size += 1
+        self.edge_id[slot] = -1
+        return slot
+        
+    def copy_slot(self, dst: int, src_store: "VehicleStore", src: int):
+        """Copy every field of slot `src` in `src_store` into slot `dst`"""
+        for name, _ in self.FIELDS:
+            getattr(self, name)[dst] = getattr(src_store, name)[src]
+
+
+def _state_field(name: str, cast) -> property:
+    """Property reading/writing one field of a vehicle's slot in its VehicleStore"""
+    def getter(self):
+        return cast(getattr(self._store, name)[self._slot])
+        
+    def setter(self, value):
+        getattr(self._store, name)[self._slot] = value
+        
+    return property(getter, setter)
+
+
+def _edge_node(attr: str) -> property:
+    """Property over one end of a vehicle's current edge; assigning it refreshes the cached edge"""
+    def getter(self):
+        return getattr(self, attr)
+        
+    def setter(self, value):
+        setattr(self, attr, value)
+        self._sync_edge()
+        
+    return property(getter, setter)
+
 
 class Vehicle:
     """
     Represents a single vehicle in the traffic simulation.
     Implements smooth, realistic movement with physics-based positioning.
     Speed is sampled from real-world statistical distributions.
+    
+    Numeric state lives in a VehicleStore slot (the VehicleManager's once the vehicle
+    is added, a private one before that); the properties below read and write it.
     """
     
-    # Vehicle capacity (how much space they occupy on an edge)
-    CAPACITY_USAGE = {
-        VehicleType.CAR: 1.0,
-        VehicleType.BIKE: 0.5,
-        VehicleType.PEDESTRIAN: 0.2
-    }
+    # Plain instance attributes; everything else is a property over the store slot
+    __slots__ = (
+        "_store", "_slot", "_manager", "id", "type", "start_node", "goal_node",
+        "_current_node", "_next_node", "_path", "_path_last", "total_distance", "_last_position", "_edge_cache"
+    )
     
-    _id_counter = 0  # Static counter for unique IDs
+    position_on_edge = _state_field("position_on_edge", float)  # 0.0 to 1.0 along current edge
+    current_speed = _state_field("current_speed", float)        # Current speed (can be reduced by traffic)
+    target_speed = _state_field("target_speed", float)          # Desired speed
+    acceleration = _state_field("acceleration", float)          # How quickly speed changes
+    speed_multiplier = _state_field("speed_multiplier", float)  # Free-flow speed (pixels/sec)
+    capacity_usage = _state_field("capacity_usage", float)      # Space taken up on an edge
+    path_index = _state_field("path_index", int)                # Index of current_node in path
+    current_node = _edge_node("_current_node")                  # Node the vehicle is at / leaving
+    next_node = _edge_node("_next_node")                        # Node the vehicle is heading to
+    wait_time = _state_field("wait_time", float)                # Time spent waiting in traffic
+    spawn_time = _state_field("spawn_time", float)              # Simulation time when added
+    reroute_count = _state_field("reroute_count", int)          # Number of reroutes so far
     
     def __init__(
         self,
@@ -206,14 +332,32 @@ class Vehicle:
             goal_node: Destination node ID
             path: Pre-calculated path (optional)
         """
-        Vehicle._id_counter += 1
-        self.id = f"{vehicle_type.value}_{Vehicle._id_counter}"
+        self._store = VehicleStore(1)
+        self._slot = self._store.append()
+        self._manager: Optional["VehicleManager"] = None  # Set while the vehicle is managed
+        self._reinit(vehicle_type, start_node, goal_node, path)
+        
+    def _reinit(
+        self,
+        vehicle_type: VehicleType,
+        start_node: str,
+        goal_node: str,
+        path: Optional[List[str]] = None
+    ):
+        """
+        (Re)initialize every field as a brand new vehicle, with a fresh ID.
+        Used by __init__ and by VehicleManager.acquire to recycle pooled vehicles.
+        """
+        self.id = f"{vehicle_type.value}_{next(_id_counter)}"
         self.type = vehicle_type
+        type_code = TYPE_CODES[vehicle_type]
+        self._store.type_code[self._slot] = type_code
         self.start_node = start_node
         self.goal_node = goal_node
-        self.current_node = start_node
-        self.next_node: Optional[str] = None
-        self.path: List[str] = path if path else []
+        self._current_node = start_node
+        self._next_node: Optional[str] = None
+        self._edge_cache = None  # Not on a road until a path is set
+        self.path = path if path else []
         self.path_index = 0
         self.status = VehicleStatus.WAITING
         
@@ -221,9 +365,9 @@ class Vehicle:
         sampled_speed_kmh = TrafficConfig.sample_speed(vehicle_type.value)
         self.speed_multiplier = sampled_speed_kmh * KMH_TO_PIXELS_PER_SEC
         
-        self.capacity_usage = self.CAPACITY_USAGE[vehicle_type]
-        self.spawn_time = time.time()
-        self.arrival_time: Optional[float] = None
+        self.capacity_usage = _CAPACITY_BY_TYPE[type_code]
+        self.spawn_time = 0.0  # Stamped with the simulation clock by VehicleManager.add_vehicle
+        self.arrival_time = None
         self.total_distance = 0.0
         
         # Physics-based movement properties
@@ -231,10 +375,56 @@ class Vehicle:
         self.current_speed = 0.0     # Current speed (can be reduced by traffic)
         self.target_speed = self.speed_multiplier  # Desired speed
         self.acceleration = 0.3      # How quickly speed changes (increased for smoother response)
-        self.wait_time = 0.0  # Time spent waiting in traffic
+        self.wait_time = 0.0
         self.reroute_count = 0
         self._last_position = 0.0    # For smoothing to prevent jitter
         
+    @property
+    def arrival_time(self) -> Optional[float]:
+        """Simulation time of arrival, or None if not arrived yet"""
+        arrival = self._store.arrival_time[self._slot]
+        return None if math.isnan(arrival) else float(arrival)
+        
+    @arrival_time.setter
+    def arrival_time(self, value: Optional[float]):
+        self._store.arrival_time[self._slot] = math.nan if value is None else value
+        
+    @property
+    def status(self) -> VehicleStatus:
+        """Status of vehicle in simulation"""
+        return STATUS_BY_CODE[self._store.status[self._slot]]
+        
+    @status.setter
+    def status(self, value: VehicleStatus):
+        self._store.status[self._slot] = STATUS_CODES[value]
+        
+    @property
+    def path(self) -> List[str]:
+        """List of node IDs from start to goal"""
+        return self._path
+        
+    @path.setter
+    def path(self, path: List[str]):
+        self._path = path
+        self._path_last = len(path) - 1  # Index of the destination in the path (-1 if empty)
+        
+    def _now(self) -> float:
+        """Current simulation time of the manager this vehicle belongs to (0.0 if unmanaged)"""
+        return self._manager.current_time if self._manager is not None else 0.0
+        
+    def _sync_edge(self):
+        """
+        Recompute the cached current edge, point this vehicle's slot at it (-1 when
+        not on a road) and move the vehicle to it in the manager's occupancy map.
+        Called whenever current_node or next_node changes.
+        """
+        edge = (self._current_node, self._next_node) if self._next_node else None
+        self._edge_cache = edge
+        edge_id = self._store.edge_index.get(edge, -1) if edge else -1
+        self._store.edge_id[self._slot] = edge_id
+        if self._manager is not None:
+            self._manager._set_edge(self.id, edge_id if self.status != VehicleStatus.ARRIVED else -1)
+        
     def set_path(self, path: List[str], cost: float = 0.0):
         """
         Set or update the vehicle's path.
@@ -248,10 +438,11 @@ class Vehicle:
         self.position_on_edge = 0.0  # Reset position when path changes
         self._last_position = 0.0    # Reset smoothing tracker
         if len(path) > 1:
-            self.next_node = path[1]
+            self._next_node = path[1]
             self.status = VehicleStatus.MOVING
         else:
-            self.next_node = None
+            self._next_node = None
+        self._sync_edge()
             
     def move_to_next_node(self) -> bool:
         """
@@ -260,24 +451,28 @@ class Vehicle:
         Returns:
             bool: True if moved successfully, False if at destination or no path
         """
-        if not self.path or self.path_index >= len(self.path) - 1:
-            # Reached destination
+        last = self._path_last
+        index = self.path_index
+        if index >= last:
+            # Reached destination (or no path)
             self.status = VehicleStatus.ARRIVED
-            self.arrival_time = time.time()
+            self.arrival_time = self._now()
             return False
             
-        self.path_index += 1
-        self.current_node = self.path[self.path_index]
+        index += 1
+        self.path_index = index
+        self._current_node = self._path[index]
         
-        if self.path_index < len(self.path) - 1:
-            self.next_node = self.path[self.path_index + 1]
+        if index < last:
+            self._next_node = self._path[index + 1]
             self.status = VehicleStatus.MOVING
             self.position_on_edge = 0.0  # Reset position for new edge
             self._last_position = 0.0    # Reset smoothing tracker
         else:
-            self.next_node = None
+            self._next_node = None
             self.status = VehicleStatus.ARRIVED
-            self.arrival_time = time.time()
+            self.arrival_time = self._now()
+        self._sync_edge()
             
         return True
     
@@ -299,14 +494,9 @@ class Vehicle:
         if self.status == VehicleStatus.STUCK and self.current_speed == 0.0 and self.target_speed == 0.0:
             return False
         
-        # Accelerate/decelerate toward target speed
-        speed_diff = self.target_speed - self.current_speed
-        if abs(speed_diff) < self.acceleration * delta_time:
-            self.current_speed = self.target_speed
-        elif speed_diff > 0:
-            self.current_speed += self.acceleration * delta_time
-        else:
-            self.current_speed -= self.acceleration * delta_time
+        # Accelerate/decelerate toward target speed, at most one acceleration step
+        step = self.acceleration * delta_time
+        self.current_speed = min(max(self.target_speed, self.current_speed - step), self.current_speed + step)
         
         # Minimum speed threshold - prevent micro-movements that cause jumping
         # Only apply when target speed is also very low (vehicle is trying to stop/crawl)
@@ -370,9 +560,7 @@ class Vehicle:
         Returns:
             Tuple of (from_node, to_node) or None
         """
-        if self.next_node:
-            return (self.current_node, self.next_node)
-        return None
+        return self._edge_cache
         
     def increment_reroute(self):
         """Increment reroute counter"""
@@ -386,7 +574,7 @@ class Vehicle:
         
     def get_travel_time(self) -> Optional[float]:
         """Get total travel time if arrived"""
-        if self.arrival_time:
+        if self.arrival_time is not None:
             return self.arrival_time - self.spawn_time
         return None
         
@@ -422,11 +610,23 @@ class VehicleManager:
     Uses data structures for efficient vehicle tracking and querying.
     """
     
+    MAX_POOLED = 10000  # Maximum number of removed vehicles kept for reuse per type
+    
     def __init__(self):
         """Initialize the vehicle manager"""
         self.vehicles: dict[str, Vehicle] = {}  # All vehicles by ID
-        self.active_vehicles: set[str] = set()  # IDs of active (not arrived) vehicles
-        self.edge_occupancy: dict[Tuple[str, str], List[str]] = {}  # Edge -> Vehicle IDs
+        self._pool: dict[VehicleType, deque[Vehicle]] = defaultdict(deque)  # Removed vehicles kept for reuse
+        self.store = VehicleStore()  # Numeric state of all vehicles, one slot each
+        self.slot_vehicles: List[Vehicle] = []  # Vehicle owning each store slot
+        self.active_vehicles: dict[str, Vehicle] = {}  # Active (not arrived) vehicles by ID
+        # Occupancy is keyed by the store's edge ids (see set_edge_index); names are
+        # only looked up at the edge query methods and pop_dirty_edges
+        self.edge_names: List[Tuple[str, str]] = []  # Edge id -> (from_node, to_node)
+        self.edge_occupancy: dict[int, set[str]] = defaultdict(set)  # Edge id -> Vehicle IDs
+        self.vehicle_edge: dict[str, int] = {}  # Vehicle ID -> edge id it occupies
+        self.dirty_edges: set[int] = set()  # Edge ids whose occupancy changed since last checked
+        self.version = 0  # Bumped whenever vehicles are added or removed (or store slots move)
+        self.current_time = 0.0  # Simulation clock (seconds), advanced once per tick by the simulator
         
     def add_vehicle(self, vehicle: Vehicle) -> str:
         """
@@ -439,8 +639,12 @@ class VehicleManager:
             Vehicle ID
         """
         self.vehicles[vehicle.id] = vehicle
+        if vehicle._manager is not self:
+            self._attach(vehicle)  # Created outside acquire - move its state into the store
+        vehicle.spawn_time = self.current_time
+        self.version += 1
         if vehicle.status != VehicleStatus.ARRIVED:
-            self.active_vehicles.add(vehicle.id)
+            self.active_vehicles[vehicle.id] = vehicle
         return vehicle.id
         
     def remove_vehicle(self, vehicle_id: str) -> bool:
@@ -454,15 +658,178 @@ class VehicleManager:
             bool: True if removed, False if not found
         """
         if vehicle_id in self.vehicles:
-            del self.vehicles[vehicle_id]
-            self.active_vehicles.discard(vehicle_id)
-            # Clean up edge occupancy
-            for edge, vehicle_list in self.edge_occupancy.items():
-                if vehicle_id in vehicle_list:
-                    vehicle_list.remove(vehicle_id)
+            vehicle = self.vehicles.pop(vehicle_id)
+            self.version += 1
+            self.active_vehicles.pop(vehicle_id, None)
+            self.release(vehicle)  # Also frees its store slot
             return True
         return False
         
+    def acquire(
+        self,
+        vehicle_type: VehicleType,
+        start_node: str,
+        goal_node: str,
+        path: Optional[List[str]] = None
+    ) -> Vehicle:
+        """
+        Get a new vehicle, recycling a previously removed one of the same type if possible.
+        The vehicle is created directly in a slot of the shared store, but is not added
+        to the simulation: call add_vehicle (or release if it is not needed after all).
+        
+        Args:
+            vehicle_type: Type of vehicle (CAR, BIKE, PEDESTRIAN)
+            start_node: Starting node ID
+            goal_node: Destination node ID
+            path: Pre-calculated path (optional)
+            
+        Returns:
+            Vehicle with a fresh ID and initial state
+        """
+        pool = self._pool[vehicle_type]
+        vehicle = pool.pop() if pool else Vehicle.__new__(Vehicle)
+        self._claim(vehicle)
+        vehicle._reinit(vehicle_type, start_node, goal_node, path)
+        return vehicle
+        
+    def release(self, vehicle: Vehicle):
+        """
+        Return a vehicle that is no longer in the simulation to the pool for reuse.
+        The caller must not use the vehicle afterwards.
+        """
+        pool = self._pool[vehicle.type]
+        pooled = len(pool) < self.MAX_POOLED
+        if vehicle._manager is self:
+            # Pooled shells are re-initialized on acquire, so their state is not kept
+            self._detach(vehicle, keep_state=not pooled)
+            self.version += 1  # Detaching can move another vehicle's slot
+        if pooled:
+            pool.append(vehicle)
+        
+    def _claim(self, vehicle: Vehicle):
+        """Give a vehicle a new slot of the shared store (its previous state is not kept)"""
+        vehicle._store, vehicle._slot = self.store, self.store.append()
+        vehicle._manager = self
+        self.slot_vehicles.append(vehicle)
+        
+    def _attach(self, vehicle: Vehicle):
+        """Move a vehicle's state into a new slot of the shared store"""
+        store, slot = vehicle._store, vehicle._slot
+        self._claim(vehicle)
+        self.store.copy_slot(vehicle._slot, store, slot)
+        self.store.edge_id[vehicle._slot] = -1
+        vehicle._sync_edge()
+        
+    def _detach(self, vehicle: Vehicle, keep_state: bool = True):
+        """
+        Free a vehicle's slot, moving the last slot into the hole so the used slots stay dense.
+        
+        Args:
+            vehicle: Vehicle to detach
+            keep_state: Copy the vehicle's state into a private store so it stays usable;
+                        otherwise it has no state until it is claimed again
+        """
+        self._set_edge(vehicle.id, -1)
+        vehicle._manager = None
+        
+        slot = vehicle._slot
+        if keep_state:
+            private = VehicleStore(1)
+            private.copy_slot(private.append(), self.store, slot)
+            private.edge_id[0] = -1
+            vehicle._store, vehicle._slot = private, 0
+        else:
+            vehicle._store, vehicle._slot = None, 0
+        
+        last = self.store.size - 1
+        if slot != last:
+            moved = self.slot_vehicles[last]
+            self.store.copy_slot(slot, self.store, last)
+            moved._slot = slot
+            self.slot_vehicles[slot] = moved
+        self.slot_vehicles.pop()
+        self.store.size -= 1
+        
+    def set_edge_index(self, edge_index: Dict[Tuple[str, str], int]):
+        """
+        Set the edge -> edge id mapping used for the vehicles' edge_id slots and the
+        occupancy map. Vehicles on edges outside the mapping are not tracked.
+        
+        Args:
+            edge_index: (from_node, to_node) -> edge id (the simulator's edge ids, 0..n-1)
+        """
+        self.store.edge_index = edge_index
+        self.edge_names = [None] * len(edge_index)
+        for edge, edge_id in edge_index.items():
+            self.edge_names[edge_id] = edge
+        # The old ids mean nothing under the new mapping, so rebuild the occupancy map
+        self.edge_occupancy.clear()
+        self.vehicle_edge.clear()
+        self.dirty_edges = set(range(len(edge_index)))
+        for vehicle in self.slot_vehicles:
+            vehicle._sync_edge()
+            
+    def road_lanes(self) -> np.ndarray:
+        """Store slots of the vehicles currently on a road (not arrived, with a next node)"""
+        n = self.store.size
+        return np.flatnonzero((self.store.edge_id[:n] >= 0) & (self.store.status[:n] != STATUS_ARRIVED))
+        
+    def tick(self, delta_time: float, edge_length_arr: np.ndarray, edge_blocked: np.ndarray) -> List[Vehicle]:
+        """
+        Run one physics step for every vehicle on a road: slow down for the vehicle
+        ahead on the same edge, then update speed and position.
+        
+        Args:
+            delta_time: Time elapsed since last tick (seconds)
+            edge_length_arr: Edge length in pixels by edge id
+            edge_blocked: Blocked flag by edge id
+            
+        Returns:
+            Vehicles that reached the end of their edge
+        """
+        store = self.store
+        lanes = self.road_lanes()
+        reached_end = tick_lanes(
+            store.status, store.current_speed, store.target_speed, store.speed_multiplier,
+            store.acceleration, store.position_on_edge, store.edge_id, lanes,
+            edge_length_arr, edge_blocked, delta_time
+        )
+        return [self.slot_vehicles[slot] for slot in lanes[reached_end].tolist()]
+        
+    def snapshot(self) -> Dict[str, list]:
+        """
+        Get the state of every vehicle in column form: one list per Vehicle.to_dict
+        key, all in store slot order. Numeric columns are read straight from the
+        store arrays instead of vehicle by vehicle.
+        
+        Returns:
+            Dictionary of column name -> list of values (one per vehicle)
+        """
+        store = self.store
+        n = store.size
+        vehicles = self.slot_vehicles
+        arrival = store.arrival_time[:n]
+        travel_times = (arrival - store.spawn_time[:n]).tolist()
+        return {
+            "id": [v.id for v in vehicles],
+            "type": [v.type.value for v in vehicles],
+            "start_node": [v.start_node for v in vehicles],
+            "goal_node": [v.goal_node for v in vehicles],
+            "current_node": [v.current_node for v in vehicles],
+            "next_node": [v.next_node for v in vehicles],
+            "path": [v.path for v in vehicles],
+            "path_index": store.path_index[:n].tolist(),
+            "status": [_STATUS_VALUES[code] for code in store.status[:n].tolist()],
+            "speed_multiplier": store.speed_multiplier[:n].tolist(),
+            "capacity_usage": store.capacity_usage[:n].tolist(),
+            "total_distance": [v.total_distance for v in vehicles],
+            "wait_time": store.wait_time[:n].tolist(),
+            "reroute_count": store.reroute_count[:n].tolist(),
+            "travel_time": [None if pending else t for pending, t in zip(np.isnan(arrival).tolist(), travel_times)],
+            "position_on_edge": store.position_on_edge[:n].tolist(),
+            "current_speed": store.current_speed[:n].tolist()
+        }
+        
     def get_vehicle(self, vehicle_id: str) -> Optional[Vehicle]:
         """Get vehicle by ID"""
         return self.vehicles.get(vehicle_id)
@@ -473,7 +840,7 @@ class VehicleManager:
         
     def get_active_vehicles(self) -> List[Vehicle]:
         """Get vehicles that haven't arrived yet"""
-        return [self.vehicles[vid] for vid in self.active_vehicles if vid in self.vehicles]
+        return list(self.active_vehicles.values())
         
     def get_vehicles_on_edge(self, from_node: str, to_node: str) -> List[Vehicle]:
         """
@@ -486,30 +853,49 @@ class VehicleManager:
         Returns:
             List of vehicles on this edge
         """
-        edge = (from_node, to_node)
-        vehicle_ids = self.edge_occupancy.get(edge, [])
-        return [self.vehicles[vid] for vid in vehicle_ids if vid in self.vehicles]
+        vehicle_ids = self._edge_occupants(from_node, to_node)
+        return [self.vehicles[vid] for vid in vehicle_ids]
         
-    def update_edge_occupancy(self):
-        """
-        Update the edge occupancy tracking.
-        This should be called after vehicles move.
+    def _edge_occupants(self, from_node: str, to_node: str):
+        """IDs of the vehicles on an edge, looked up by node names"""
+        edge_id = self.store.edge_index.get((from_node, to_node), -1)
+        return self.edge_occupancy.get(edge_id, ())
+        
+    def _set_edge(self, vehicle_id: str, new_edge: int):
         """
-        # Clear existing occupancy
-        self.edge_occupancy.clear()
+        Move a vehicle between edges in the occupancy map.
+        Called whenever a vehicle's current edge changes, so the map is always up to date.
         
-        # Rebuild occupancy map
-        for vehicle in self.get_active_vehicles():
-            edge = vehicle.get_current_edge()
-            if edge:
-                if edge not in self.edge_occupancy:
-                    self.edge_occupancy[edge] = []
-                self.edge_occupancy[edge].append(vehicle.id)
+        Args:
+            vehicle_id: ID of the vehicle
+            new_edge: Edge id it now occupies, or -1 if it is no longer on a tracked road
+        """
+        old_edge = self.vehicle_edge.get(vehicle_id, -1)
+        if old_edge == new_edge:
+            return
+        if old_edge >= 0:
+            occupants = self.edge_occupancy[old_edge]
+            occupants.discard(vehicle_id)
+            if not occupants:
+                del self.edge_occupancy[old_edge]
+            self.dirty_edges.add(old_edge)
+        if new_edge >= 0:
+            self.edge_occupancy[new_edge].add(vehicle_id)
+            self.vehicle_edge[vehicle_id] = new_edge
+            self.dirty_edges.add(new_edge)
+        else:
+            self.vehicle_edge.pop(vehicle_id, None)
+                
+    def pop_dirty_edges(self) -> List[Tuple[str, str]]:
+        """Return the edges whose occupancy changed since the last call, and reset the set"""
+        dirty = self.dirty_edges
+        self.dirty_edges = set()
+        edge_names = self.edge_names
+        return [edge_names[edge_id] for edge_id in dirty]
                 
     def get_edge_vehicle_count(self, from_node: str, to_node: str) -> int:
         """Get number of vehicles on an edge"""
-        edge = (from_node, to_node)
-        return len(self.edge_occupancy.get(edge, []))
+        return len(self._edge_occupants(from_node, to_node))
         
     def get_edge_capacity_usage(self, from_node: str, to_node: str) -> float:
         """
@@ -519,15 +905,15 @@ class VehicleManager:
         Returns:
             Total capacity usage (sum of all vehicle capacities)
         """
-        vehicles = self.get_vehicles_on_edge(from_node, to_node)
-        return sum(v.capacity_usage for v in vehicles)
+        vehicle_ids = self._edge_occupants(from_node, to_node)
+        return sum(self.vehicles[vid].capacity_usage for vid in vehicle_ids)
         
     def mark_vehicle_arrived(self, vehicle_id: str):
         """Mark a vehicle as arrived and remove from active set"""
-        if vehicle_id in self.active_vehicles:
-            self.active_vehicles.remove(vehicle_id)
-            if vehicle_id in self.vehicles:
-                self.vehicles[vehicle_id].status = VehicleStatus.ARRIVED
+        vehicle = self.active_vehicles.pop(vehicle_id, None)
+        if vehicle is not None:
+            self._set_edge(vehicle_id, -1)
+            vehicle.status = VehicleStatus.ARRIVED
                 
     def clear_arrived_vehicles(self):
         """Remove all arrived vehicles from the simulation"""
@@ -542,35 +928,41 @@ class VehicleManager:
         Returns:
             Dictionary with statistics
         """
-        all_vehicles = self.get_all_vehicles()
-        active = self.get_active_vehicles()
-        arrived = [v for v in all_vehicles if v.status == VehicleStatus.ARRIVED]
-        
-        total_travel_time = sum(v.get_travel_time() or 0 for v in arrived)
-        avg_travel_time = total_travel_time / len(arrived) if arrived else 0
+        # Every managed vehicle owns a store slot, so reduce straight over the arrays
+        store = self.store
+        n = store.size
+        arrived = store.status[:n] == STATUS_ARRIVED
+        arrived_count = int(np.count_nonzero(arrived))
         
-        total_wait_time = sum(v.wait_time for v in all_vehicles)
-        avg_wait_time = total_wait_time / len(all_vehicles) if all_vehicles else 0
+        # Vehicles marked arrived without an arrival time count as 0 (NaN is skipped)
+        travel_times = store.arrival_time[:n][arrived] - store.spawn_time[:n][arrived]
+        avg_travel_time = float(np.nansum(travel_times)) / arrived_count if arrived_count else 0
         
-        total_reroutes = sum(v.reroute_count for v in all_vehicles)
+        avg_wait_time = float(store.wait_time[:n].mean()) if n else 0
+        total_reroutes = int(store.reroute_count[:n].sum())
+        type_counts = np.bincount(store.type_code[:n], minlength=len(TYPE_CODES))
         
         return {
-            "total_vehicles": len(all_vehicles),
-            "active_vehicles": len(active),
-            "arrived_vehicles": len(arrived),
+            "total_vehicles": n,
+            "active_vehicles": len(self.active_vehicles),
+            "arrived_vehicles": arrived_count,
             "average_travel_time": avg_travel_time,
             "average_wait_time": avg_wait_time,
             "total_reroutes": total_reroutes,
             "vehicles_by_type": {
-                "car": len([v for v in all_vehicles if v.type == VehicleType.CAR]),
-                "bicycle": len([v for v in all_vehicles if v.type == VehicleType.BIKE]),
-                "pedestrian": len([v for v in all_vehicles if v.type == VehicleType.PEDESTRIAN])
+                "car": int(type_counts[TYPE_CODES[VehicleType.CAR]]),
+                "bicycle": int(type_counts[TYPE_CODES[VehicleType.BIKE]]),
+                "pedestrian": int(type_counts[TYPE_CODES[VehicleType.PEDESTRIAN]])
             }
         }
         
     def reset(self):
         """Clear all vehicles and reset the manager"""
+        while self.slot_vehicles:
+            self._detach(self.slot_vehicles[-1])
         self.vehicles.clear()
         self.active_vehicles.clear()
-        self.edge_occupancy.clear()
-        Vehicle._id_counter = 0
+        self.version += 1
+        self.current_time = 0.0
+        global _id_counter
+        _id_counter = itertools.count(1)
@@ -0,0 +1,293 @@
+# vehicle_kernels.py
+# Numeric kernels for the per-tick vehicle physics
+# Kernels work on the structure-of-arrays vehicle storage in VehicleManager and take
+# `lanes`, the slots of the vehicles currently on a road, so parked vehicles are skipped
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - the NumPy versions below are used instead
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Integer status codes stored in the status array (see vehicle.STATUS_CODES)
+STATUS_WAITING = 0
+STATUS_MOVING = 1
+STATUS_STUCK = 2
+STATUS_ARRIVED = 3
+STATUS_REROUTING = 4
+
+MIN_FOLLOWING_DISTANCE = 30.0  # pixels, as in Vehicle.slow_down_for_vehicle_ahead
+MIN_SPEED_THRESHOLD = 0.5      # pixels/sec, as in Vehicle.update_position
+
+# Fast-math flags for the compiled kernels. "nnan"/"ninf" are left out because an
+# infinite gap is how the kernels encode "no vehicle ahead"; "arcp", "contract" and
+# "reassoc" are left out because they change rounding, and the kernels are meant to
+# match Vehicle.update_position / slow_down_for_vehicle_ahead exactly.
+_FASTMATH = {"nsz", "afn"}
+
+# Eager signature of _tick_kernel, compiled at import instead of on the first tick
+_TICK_SIGNATURE = (
+    "b1[::1](i1[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], "
+    "i4[::1], i8[::1], f8[::1], b1[::1], f8, f8)"
+)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _control_lane(i, status, current_speed, target_speed, speed_multiplier, gap, blocked, min_distance):
+    """
+    Adjust one vehicle's target speed for the vehicle ahead (same rules as
+    Vehicle.slow_down_for_vehicle_ahead, with gap = inf meaning a clear road).
+    Every rung of the ladder is evaluated and the result picked with selects,
+    so there are no data-dependent branches.
+    """
+    active = not blocked
+    multiplier = speed_multiplier[i]
+
+    # Frozen by traffic but the road is not blocked - unfreeze and recalculate
+    unfreeze = active and status[i] == STATUS_STUCK and current_speed[i] == 0.0 and target_speed[i] == 0.0
+    code = STATUS_MOVING if unfreeze else status[i]
+    target = multiplier if unfreeze else target_speed[i]
+
+    freeze = active and gap < min_distance                             # too close - freeze completely
+    crawl = active and gap >= min_distance and gap < min_distance * 1.5  # close - slow crawl
+    resume = active and gap >= min_distance * 2.5                      # clear ahead - normal speed
+    # (between crawl and resume distance is a hysteresis zone that keeps the target)
+
+    crawl_speed = max(multiplier * 0.15, multiplier * (gap / (min_distance * 2))) if crawl else 0.0
+    target = 0.0 if freeze else (crawl_speed if crawl else (multiplier if resume else target))
+    current_speed[i] = 0.0 if freeze else current_speed[i]
+    code = STATUS_STUCK if freeze else (STATUS_MOVING if resume and code == STATUS_STUCK else code)
+
+    target_speed[i] = target
+    status[i] = code
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _advance_lane(i, status, current_speed, target_speed, acceleration, position_on_edge, edge_length, blocked, delta_time):
+    """
+    Integrate one vehicle's speed and position along its edge (same rules as
+    Vehicle.update_position). Returns True if it reached the end of the edge.
+    """
+    if blocked:
+        # Don't allow movement on blocked edges
+        if current_speed[i] != 0.0:
+            target_speed[i] = 0.0
+            status[i] = STATUS_STUCK
+        return False
+
+    if status[i] != STATUS_MOVING and status[i] != STATUS_STUCK:
+        return False
+    if status[i] == STATUS_STUCK and current_speed[i] == 0.0 and target_speed[i] == 0.0:
+        return False
+
+    # Accelerate/decelerate toward target speed: clamp the target into the
+    # reachable range instead of branching on the sign of the difference
+    step = acceleration[i] * delta_time
+    current_speed[i] = min(max(target_speed[i], current_speed[i] - step), current_speed[i] + step)
+
+    # Prevent micro-movements when the vehicle is trying to stop
+    if target_speed[i] < 1.0 and abs(current_speed[i]) < MIN_SPEED_THRESHOLD:
+        current_speed[i] = 0.0
+        return False
+
+    position_change = current_speed[i] * delta_time / edge_length
+    if abs(position_change) > 0.0001:
+        position_on_edge[i] = max(0.0, min(1.0, position_on_edge[i] + position_change))
+
+    if position_on_edge[i] >= 1.0:
+        position_on_edge[i] = 1.0
+        return True
+    return False
+
+
+@njit(_TICK_SIGNATURE, cache=True, parallel=True, fastmath=_FASTMATH)
+def _tick_kernel(status, current_speed, target_speed, speed_multiplier, acceleration, position_on_edge,
+                 edge_id, lanes, edge_length_arr, edge_blocked, delta_time, min_distance):
+    """
+    Fused physics step: speed control and position update in a single pass.
+    Lanes are sorted by (edge, position) and each edge is swept from the front
+    vehicle backwards, so a vehicle's leader has always just been visited. The
+    leader's position from before its own update is carried along, so every
+    vehicle reacts to the same snapshot of the road.
+    Vehicles only interact within an edge, so edges are processed in parallel.
+    Returns a mask over `lanes` of vehicles that reached the end of their edge.
+    """
+    m = len(lanes)
+    reached_end = np.zeros(m, dtype=np.bool_)
+    # position_on_edge is in [0, 1], so this key sorts by edge first, then position
+    keys = np.empty(m)
+    for j in prange(m):
+        keys[j] = edge_id[lanes[j]] * 2.0 + position_on_edge[lanes[j]]
+    order = np.argsort(keys)
+
+    # Sorted positions where a new edge group starts
+    is_start = np.empty(m, dtype=np.bool_)
+    for j in prange(m):
+        is_start[j] = j == 0 or edge_id[lanes[order[j]]] != edge_id[lanes[order[j - 1]]]
+    group_starts = np.nonzero(is_start)[0]
+    n_groups = len(group_starts)
+
+    for g in prange(n_groups):
+        first = group_starts[g]
+        k = group_starts[g + 1] - 1 if g + 1 < n_groups else m - 1
+        edge = edge_id[lanes[order[k]]]
+        edge_length = edge_length_arr[edge]
+        blocked = edge_blocked[edge]
+        lead_pos = -1.0
+        while k >= first:
+            pos = position_on_edge[lanes[order[k]]]
+            gap = (lead_pos - pos) * edge_length if lead_pos >= 0.0 else np.inf
+            # Vehicles at exactly the same position are not ahead of each other
+            while k >= first and position_on_edge[lanes[order[k]]] == pos:
+                i = lanes[order[k]]
+                _control_lane(i, status, current_speed, target_speed, speed_multiplier, gap, blocked, min_distance)
+                reached_end[order[k]] = _advance_lane(
+                    i, status, current_speed, target_speed, acceleration, position_on_edge,
+                    edge_length, blocked, delta_time
+                )
+                k -= 1
+            lead_pos = pos
+    return reached_end
+
+
+def _ahead_gaps_sorted(edge_id, position_on_edge, edge_length_arr, lanes):
+    """
+    Distance (pixels) from each lane to the nearest vehicle strictly ahead of it
+    on the same edge, or inf if there is none. Used when Numba is not installed.
+    Sweep and prune: lanes are sorted by (edge, position), so the vehicle ahead is
+    the first one of the next run of equal positions on the same edge.
+    O(V log V) overall, with no Python-level loop.
+    """
+    edges = edge_id[lanes]
+    positions = position_on_edge[lanes]
+    order = np.lexsort((positions, edges))
+    edges = edges[order]
+    positions = positions[order]
+
+    # Runs of vehicles at exactly the same position (they are not ahead of each other)
+    run_start = np.ones(len(order), dtype=bool)
+    run_start[1:] = (edges[1:] != edges[:-1]) | (positions[1:] != positions[:-1])
+    run_id = np.cumsum(run_start) - 1
+    run_edge = edges[run_start]
+    run_pos = positions[run_start]
+
+    # The leader of each run is the next run, if it is on the same edge
+    lead_pos = np.full(len(run_pos), np.inf)
+    same_edge = run_edge[1:] == run_edge[:-1]
+    lead_pos[:-1][same_edge] = run_pos[1:][same_edge]
+
+    gaps = np.empty(len(order))
+    gaps[order] = (lead_pos[run_id] - positions) * edge_length_arr[edges]
+    return gaps
+
+
+def _speed_control_vectorized(status, current_speed, target_speed, speed_multiplier, gaps, on_blocked, lanes, min_distance):
+    """
+    NumPy equivalent of _control_lane over all lanes.
+    Each rung of the ladder becomes a lane mask and the results are merged with np.where.
+    """
+    code = status[lanes]
+    current = current_speed[lanes]
+    target = target_speed[lanes]
+    multiplier = speed_multiplier[lanes]
+    active = ~on_blocked
+
+    unfreeze = active & (code == STATUS_STUCK) & (current == 0.0) & (target == 0.0)
+    code = np.where(unfreeze, STATUS_MOVING, code)
+    target = np.where(unfreeze, multiplier, target)
+
+    freeze = active & (gaps < min_distance)
+    crawl = active & (gaps >= min_distance) & (gaps < min_distance * 1.5)
+    resume = active & (gaps >= min_distance * 2.5)
+
+    with np.errstate(invalid="ignore"):  # inf gaps only feed lanes masked out below
+        crawl_speed = np.maximum(multiplier * 0.15, multiplier * (gaps / (min_distance * 2)))
+    target = np.where(freeze, 0.0, np.where(crawl, crawl_speed, np.where(resume, multiplier, target)))
+    code = np.where(freeze, STATUS_STUCK, np.where(resume & (code == STATUS_STUCK), STATUS_MOVING, code))
+
+    current_speed[lanes] = np.where(freeze, 0.0, current)
+    target_speed[lanes] = target
+    status[lanes] = code
+
+
+def _position_update_vectorized(status, current_speed, target_speed, acceleration, position_on_edge,
+                                edge_length, on_blocked, lanes, delta_time):
+    """
+    NumPy equivalent of _advance_lane over all lanes.
+    Returns a mask over `lanes` of vehicles that reached the end of their edge.
+    """
+    code = status[lanes]
+    current = current_speed[lanes]
+    target = target_speed[lanes]
+
+    # Don't allow movement on blocked edges
+    halt = on_blocked & (current != 0.0)
+    target_speed[lanes] = np.where(halt, 0.0, target)
+    status[lanes] = np.where(halt, STATUS_STUCK, code)
+
+    frozen = (code == STATUS_STUCK) & (current == 0.0) & (target == 0.0)
+    moving = ~on_blocked & ((code == STATUS_MOVING) | (code == STATUS_STUCK)) & ~frozen
+
+    # Accelerate/decelerate toward target speed
+    step = acceleration[lanes] * delta_time
+    new_speed = np.minimum(np.maximum(target, current - step), current + step)
+
+    # Prevent micro-movements when the vehicle is trying to stop
+    stopping = moving & (target < 1.0) & (np.abs(new_speed) < MIN_SPEED_THRESHOLD)
+    current_speed[lanes] = np.where(stopping, 0.0, np.where(moving, new_speed, current))
+    rolling = moving & ~stopping
+
+    position = position_on_edge[lanes]
+    position_change = new_speed * delta_time / edge_length
+    shift = rolling & (np.abs(position_change) > 0.0001)
+    position = np.where(shift, np.clip(position + position_change, 0.0, 1.0), position)
+
+    reached_end = rolling & (position >= 1.0)
+    position_on_edge[lanes] = np.where(reached_end, 1.0, position)
+    return reached_end
+
+
+def tick_lanes(status, current_speed, target_speed, speed_multiplier, acceleration, position_on_edge,
+               edge_id, lanes, edge_length_arr, edge_blocked, delta_time):
+    """
+    Run one physics step over the given lanes: slow down for the vehicle ahead,
+    then integrate speed and position.
+
+    Args:
+        status, current_speed, target_speed, speed_multiplier, acceleration,
+        position_on_edge, edge_id: Vehicle state arrays (updated in place)
+        lanes: Slots of the vehicles on a road
+        edge_length_arr: Edge length in pixels by edge id
+        edge_blocked: Blocked flag by edge id
+        delta_time: Time elapsed since last tick (seconds)
+
+    Returns:
+        Boolean mask over `lanes` of vehicles that reached the end of their edge
+    """
+    if NUMBA_AVAILABLE:
+        return _tick_kernel(
+            status, current_speed, target_speed, speed_multiplier, acceleration, position_on_edge,
+            edge_id, lanes, edge_length_arr, edge_blocked, delta_time, MIN_FOLLOWING_DISTANCE
+        )
+
+    # Uncompiled, a handful of whole-array passes beat a fused per-vehicle loop
+    lane_edges = edge_id[lanes]
+    on_blocked = edge_blocked[lane_edges]
+    gaps = _ahead_gaps_sorted(edge_id, position_on_edge, edge_length_arr, lanes)
+    _speed_control_vectorized(
+        status, current_speed, target_speed, speed_multiplier, gaps, on_blocked, lanes, MIN_FOLLOWING_DISTANCE
+    )
+    return _position_update_vectorized(
+        status, current_speed, target_speed, acceleration, position_on_edge,
+        edge_length_arr[lane_edges], on_blocked, lanes, delta_time
+    )